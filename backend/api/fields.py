@@ -0,0 +1,102 @@
+from collections.abc import Mapping
+from uuid import uuid4
+
+from django.core.files.storage import default_storage
+from PIL import Image
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+from api.uploads import decode_base64, run_verification
+
+
+IMAGE_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif'}
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    objects = None
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+    @staticmethod
+    def to_pk(data):
+        if isinstance(data, bool):
+            raise TypeError
+        return int(data)
+
+    def prefetch(self, values):
+        pks = set()
+        for value in values:
+            try:
+                pks.add(self.to_pk(value))
+            except (TypeError, ValueError):
+                continue
+        self.objects = self.get_queryset().in_bulk(pks)
+
+    def to_internal_value(self, data):
+        if self.objects is None:
+            return super().to_internal_value(data)
+        try:
+            pk = self.to_pk(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in self.objects:
+            self.fail('does_not_exist', pk_value=data)
+        return self.objects[pk]
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.child_relation.prefetch(data)
+        return super().to_internal_value(data)
+
+
+class Base64ImageField(serializers.ImageField):
+
+    def to_internal_value(self, data):
+        if data in (None, ''):
+            return None
+        if isinstance(data, str):
+            data = decode_base64(data)
+        file = serializers.FileField.to_internal_value(self, data)
+        image_format = run_verification(file)
+        if image_format not in IMAGE_EXTENSIONS:
+            self.fail('invalid_image')
+        file.name = f'{uuid4()}.{IMAGE_EXTENSIONS[image_format]}'
+        file.content_type = Image.MIME[image_format]
+        return file
+
+
+class RenditionsField(serializers.ReadOnlyField):
+
+    def to_representation(self, renditions):
+        request = self.context.get('request')
+        urls = {}
+        for name, formats in renditions.get('files', {}).items():
+            urls[name] = {}
+            for extension, path in formats.items():
+                url = default_storage.url(path)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                urls[name][extension] = url
+        return urls
+
+
+class BulkListSerializer(serializers.ListSerializer):
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            for name, field in self.child.fields.items():
+                if isinstance(field, BulkPrimaryKeyRelatedField):
+                    field.prefetch(
+                        item[name] for item in data
+                        if isinstance(item, Mapping) and name in item
+                    )
+        return super().to_internal_value(data)
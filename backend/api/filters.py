@@ -1,6 +1,9 @@
 import django_filters
+from django.db.models import Exists, OuterRef, Sum
 
-from recipe.models import Ingredient, Recipe, Tag
+from api.ingredient_search import search_ingredients
+from recipe.models import Ingredient, Recipe, RecipeLemma, Tag
+from recipe.search import query_lemmas
 
 
 class RecipeFilter(django_filters.FilterSet):
@@ -18,18 +21,20 @@ class RecipeFilter(django_filters.FilterSet):
         choices=[(1, 'Yes'), (0, 'No')],
         method='filter_is_in_shopping_cart'
     )
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Recipe
-        fields = ('author', 'tags', 'is_favorited', 'is_in_shopping_cart')
+        fields = (
+            'author', 'tags', 'is_favorited', 'is_in_shopping_cart', 'search'
+        )
 
     def filter_tags(self, recipes_set, name, value):
-        response = recipes_set
-        if value:
-            response = recipes_set.none()
-            for tag in value:
-                response |= recipes_set.filter(tags__slug=tag.slug)
-        return response.distinct()
+        if not value:
+            return recipes_set
+        return recipes_set.filter(id__in=Recipe.tags.through.objects.filter(
+            tag__in=value
+        ).values('recipe_id'))
 
     def filter_is_favorited(self, recipes_set, name, value):
         if self.request.user.is_authenticated and value == '1':
@@ -43,10 +48,27 @@ class RecipeFilter(django_filters.FilterSet):
             recipes_set = recipes_set.filter(carts__user=user)
         return recipes_set
 
+    def filter_search(self, recipes_set, name, value):
+        words = query_lemmas(value)
+        if not words:
+            return recipes_set
+        for variants in words:
+            recipes_set = recipes_set.filter(Exists(RecipeLemma.objects.filter(
+                recipe=OuterRef('pk'), lemma__in=variants
+            )))
+        return recipes_set.filter(
+            lemmas__lemma__in=set().union(*words)
+        ).annotate(
+            search_rank=Sum('lemmas__weight')
+        ).order_by('-search_rank', '-created_at')
+
 
 class IngredientFilter(django_filters.FilterSet):
-    name = django_filters.CharFilter(lookup_expr='icontains')
+    name = django_filters.CharFilter(method='filter_name')
 
     class Meta:
         model = Ingredient
         fields = ('name',)
+
+    def filter_name(self, ingredients, name, value):
+        return search_ingredients(ingredients, value)
@@ -0,0 +1,126 @@
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from threading import Lock
+
+from django.db import connection
+from django.db.models import Case, Count, IntegerField, Max, Value, When
+from django.dispatch import receiver
+
+from recipe.cache import reference_data_changed
+from recipe.constants import INGREDIENT_SEARCH_LIMIT
+from recipe.models import Ingredient
+
+
+Catalog = namedtuple('Catalog', ('names', 'ids', 'offsets', 'text'))
+
+
+class PrefixIndex:
+    SEPARATOR = '\n'
+    VERSION_CHECK_INTERVAL = 30
+
+    def __init__(self):
+        self.lock = Lock()
+        self.version = None
+        self.checked_at = 0
+        self.catalog = Catalog([], [], [], '')
+
+    def get_version(self):
+        return tuple(Ingredient.objects.aggregate(
+            count=Count('id'), last_id=Max('id')
+        ).values())
+
+    def build(self):
+        rows = sorted(
+            (name.lower(), pk)
+            for pk, name in Ingredient.objects.values_list('id', 'name')
+        )
+        names = [name for name, _ in rows]
+        offsets = []
+        offset = 0
+        for name in names:
+            offsets.append(offset)
+            offset += len(name) + len(self.SEPARATOR)
+        return Catalog(
+            names, [pk for _, pk in rows], offsets, self.SEPARATOR.join(names)
+        )
+
+    def invalidate(self):
+        self.version = None
+        self.checked_at = 0
+
+    def refresh(self):
+        now = time.monotonic()
+        if now - self.checked_at < self.VERSION_CHECK_INTERVAL:
+            return self.catalog
+        with self.lock:
+            version = self.get_version()
+            if version != self.version:
+                self.catalog = self.build()
+                self.version = version
+            self.checked_at = now
+        return self.catalog
+
+    @staticmethod
+    def prefix_matches(catalog, query, limit):
+        matches = []
+        position = bisect_left(catalog.names, query)
+        while (
+            len(matches) < limit
+            and position < len(catalog.names)
+            and catalog.names[position].startswith(query)
+        ):
+            matches.append(catalog.ids[position])
+            position += 1
+        return matches
+
+    @staticmethod
+    def substring_matches(catalog, query, limit):
+        matches = []
+        start = catalog.text.find(query)
+        while start != -1 and len(matches) < limit:
+            position = bisect_right(catalog.offsets, start) - 1
+            if not catalog.names[position].startswith(query):
+                matches.append(catalog.ids[position])
+            if position + 1 == len(catalog.offsets):
+                break
+            start = catalog.text.find(query, catalog.offsets[position + 1])
+        return matches
+
+    def search(self, query, limit):
+        catalog = self.refresh()
+        if self.SEPARATOR in query:
+            return []
+        matches = self.prefix_matches(catalog, query, limit)
+        return matches + self.substring_matches(
+            catalog, query, limit - len(matches)
+        )
+
+
+prefix_index = PrefixIndex()
+
+
+@receiver(reference_data_changed, sender=Ingredient)
+def invalidate_prefix_index(**kwargs):
+    prefix_index.invalidate()
+
+
+def search_ingredients(ingredients, query, limit=INGREDIENT_SEARCH_LIMIT):
+    query = query.strip().lower()
+    if not query:
+        return ingredients
+    if connection.vendor == 'postgresql':
+        return ingredients.filter(name__icontains=query).annotate(
+            is_substring=Case(
+                When(name__istartswith=query, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField()
+            )
+        ).order_by('is_substring', 'name')[:limit]
+    ids = prefix_index.search(query, limit)
+    if not ids:
+        return ingredients.none()
+    return ingredients.filter(id__in=ids).order_by(Case(
+        *(When(id=pk, then=Value(rank)) for rank, pk in enumerate(ids)),
+        output_field=IntegerField()
+    ))
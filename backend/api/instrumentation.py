@@ -0,0 +1,194 @@
+import logging
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from threading import Lock, local
+
+from django.conf import settings
+from django.db import connections
+
+from backend.metrics import DB_QUERIES, REQUEST_DURATION, REQUESTS
+
+
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+UNRESOLVED = 'unresolved'
+
+logger = logging.getLogger(__name__)
+state = local()
+
+
+class BudgetExceeded(AssertionError):
+    pass
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+class EndpointStats:
+
+    def __init__(self):
+        self.lock = Lock()
+        self.endpoints = {}
+
+    def record(self, endpoint, values):
+        with self.lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = {
+                    'count': 0,
+                    'buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+                    'over_budget': 0,
+                    **{f'{name}_sum': 0 for name in values},
+                    **{f'{name}_max': 0 for name in values},
+                }
+            stats['count'] += 1
+            stats['buckets'][
+                bisect_left(LATENCY_BUCKETS, values['duration_ms'])
+            ] += 1
+            for name, value in values.items():
+                stats[f'{name}_sum'] += value
+                stats[f'{name}_max'] = max(stats[f'{name}_max'], value)
+
+    def mark_over_budget(self, endpoint):
+        with self.lock:
+            self.endpoints[endpoint]['over_budget'] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                endpoint: {
+                    **stats,
+                    'buckets': dict(zip(
+                        (*map(str, LATENCY_BUCKETS), '+Inf'),
+                        stats['buckets']
+                    )),
+                }
+                for endpoint, stats in sorted(self.endpoints.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+endpoint_stats = EndpointStats()
+
+
+class TimedSerializerMixin:
+
+    def to_representation(self, instance):
+        metrics = getattr(state, 'metrics', None)
+        if metrics is None or metrics.serializer_depth:
+            return super().to_representation(instance)
+        metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_depth -= 1
+            metrics.serializer_time += time.perf_counter() - started
+
+
+def get_route(request):
+    match = request.resolver_match
+    return match.view_name if match else UNRESOLVED
+
+
+def get_budget(endpoint):
+    budgets = settings.ENDPOINT_BUDGETS
+    return budgets.get(endpoint) or budgets.get(endpoint.split(' ', 1)[1])
+
+
+class InstrumentationMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @contextmanager
+    def track(self, metrics):
+        previous = getattr(state, 'metrics', None)
+        state.metrics = metrics
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                yield
+        finally:
+            state.metrics = previous
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        started = time.perf_counter()
+        with self.track(metrics):
+            response = self.get_response(request)
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = ', '.join((
+                f'db;dur={metrics.db_time * 1000:.1f};'
+                f'desc="{metrics.queries} queries"',
+                f'serializer;dur={metrics.serializer_time * 1000:.1f}',
+                f'app;dur={(time.perf_counter() - started) * 1000:.1f}',
+            ))
+        if response.streaming:
+            response.streaming_content = self.stream(
+                response.streaming_content, request, response, metrics,
+                started
+            )
+            return response
+        self.finish(
+            request, response, metrics, started, len(response.content)
+        )
+        return response
+
+    def stream(self, content, request, response, metrics, started):
+        size = 0
+        try:
+            with self.track(metrics):
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            self.finish(request, response, metrics, started, size)
+
+    def finish(self, request, response, metrics, started, size):
+        route = get_route(request)
+        endpoint = f'{request.method} {route}'
+        duration = time.perf_counter() - started
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        REQUEST_DURATION.labels(route, request.method).observe(duration)
+        DB_QUERIES.labels(route, request.method).observe(metrics.queries)
+        values = {
+            'duration_ms': duration * 1000,
+            'queries': metrics.queries,
+            'db_ms': metrics.db_time * 1000,
+            'serializer_ms': metrics.serializer_time * 1000,
+            'response_bytes': size,
+        }
+        endpoint_stats.record(endpoint, values)
+        budget = get_budget(endpoint)
+        if not budget:
+            return
+        exceeded = [
+            f'{name}={values[name]:.0f} (бюджет {limit})'
+            for name, limit in budget.items() if values[name] > limit
+        ]
+        if not exceeded:
+            return
+        endpoint_stats.mark_over_budget(endpoint)
+        message = f'{endpoint}: превышен бюджет: {", ".join(exceeded)}'
+        if settings.ENDPOINT_BUDGETS_STRICT:
+            raise BudgetExceeded(message)
+        logger.warning(message)
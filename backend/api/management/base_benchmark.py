@@ -0,0 +1,135 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from recipe.models import Ingredient, Recipe, RecipeComponent, Tag, User
+
+
+BENCHMARK_PREFIX = 'benchmark'
+BATCH_SIZE = 1000
+
+
+class BaseBenchmark(BaseCommand):
+    help = 'Замер производительности на временно заполненной БД'
+    default_recipes = 300
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recipes', type=int, default=self.default_recipes,
+            help='Количество рецептов для заполнения БД'
+        )
+        parser.add_argument(
+            '--ingredients', type=int, default=15,
+            help='Количество продуктов в рецепте'
+        )
+        parser.add_argument(
+            '--tags', type=int, default=10,
+            help='Количество тегов'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Количество повторов каждого замера'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Начальное значение генератора случайных чисел'
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+        ), transaction.atomic():
+            started = time.perf_counter()
+            self.seed(options)
+            self.stdout.write(
+                f'БД заполнена за {time.perf_counter() - started:.1f} c: '
+                f'{Recipe.objects.count()} рецептов'
+            )
+            self.benchmark(options)
+            transaction.set_rollback(True)
+
+    def benchmark(self, options):
+        raise NotImplementedError
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - started) * 1000)
+        return len(queries.captured_queries), statistics.median(timings)
+
+    def report(self, title, queries, milliseconds):
+        self.stdout.write(
+            f'{title:<40} запросов: {queries:>5}  '
+            f'время: {milliseconds:>9.2f} мс'
+        )
+
+    def seed(self, options):
+        User.objects.bulk_create(
+            User(
+                username=f'{BENCHMARK_PREFIX}_{i}',
+                email=f'{BENCHMARK_PREFIX}_{i}@example.com',
+                first_name='Benchmark', last_name=str(i),
+            )
+            for i in range(10)
+        )
+        self.users = list(
+            User.objects.filter(username__startswith=BENCHMARK_PREFIX)
+        )
+        Tag.objects.bulk_create(
+            Tag(
+                name=f'{BENCHMARK_PREFIX}_{i}',
+                slug=f'{BENCHMARK_PREFIX}_{i}'
+            )
+            for i in range(options['tags'])
+        )
+        self.tags = list(
+            Tag.objects.filter(slug__startswith=BENCHMARK_PREFIX)
+        )
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'{BENCHMARK_PREFIX}_{i}', measurement_unit='г')
+            for i in range(max(options['ingredients'] * 4, 100))
+        )
+        self.ingredients = list(Ingredient.objects.filter(
+            name__startswith=BENCHMARK_PREFIX
+        ).values_list('id', flat=True))
+        for start in range(0, options['recipes'], BATCH_SIZE):
+            self.seed_recipes(
+                min(BATCH_SIZE, options['recipes'] - start), options
+            )
+
+    def seed_recipes(self, count, options):
+        recipes = Recipe.objects.bulk_create(
+            Recipe(
+                name=f'{BENCHMARK_PREFIX} {i}', text=BENCHMARK_PREFIX,
+                cooking_time=self.random.randint(1, 120),
+                author=self.random.choice(self.users),
+                image=f'food image/{BENCHMARK_PREFIX}.png',
+            )
+            for i in range(count)
+        )
+        if recipes[0].pk is None:
+            recipes = list(Recipe.objects.order_by('-id')[:count])
+        Recipe.tags.through.objects.bulk_create(
+            Recipe.tags.through(recipe_id=recipe.id, tag_id=tag.id)
+            for recipe in recipes
+            for tag in self.random.sample(
+                self.tags, self.random.randint(1, min(3, len(self.tags)))
+            )
+        )
+        RecipeComponent.objects.bulk_create(
+            RecipeComponent(recipe_id=recipe.id, product_id=product_id,
+                            amount=self.random.randint(1, 500))
+            for recipe in recipes
+            for product_id in self.random.sample(
+                self.ingredients, options['ingredients']
+            )
+        )
@@ -0,0 +1,56 @@
+from rest_framework.test import APIRequestFactory
+
+from api.management.base_benchmark import BaseBenchmark
+from api.paginators import KeysetPagination
+from api.views import RecipeViewSet
+from recipe.models import Recipe
+
+
+class Command(BaseBenchmark):
+    help = 'Сравнение постраничной и курсорной пагинации /api/recipes/'
+    default_recipes = 20_000
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--pages', type=int, nargs='+', default=(1, 100, 1000),
+            help='Номера страниц для замера'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=6,
+            help='Размер страницы'
+        )
+
+    def cursor_for_page(self, page, limit):
+        if page == 1:
+            return ''
+        last = Recipe.objects.order_by('-created_at', '-id')[
+            (page - 1) * limit - 1
+        ]
+        paginator = KeysetPagination()
+        return paginator.encode_cursor(False, paginator.position(last))
+
+    def benchmark(self, options):
+        factory = APIRequestFactory()
+        view = RecipeViewSet.as_view({'get': 'list'})
+        limit = options['limit']
+        pages = [
+            page for page in options['pages']
+            if (page - 1) * limit < options['recipes']
+        ]
+        for page in pages:
+            cursor = self.cursor_for_page(page, limit)
+            for title, params in (
+                ('page', {'page': page, 'limit': limit}),
+                ('cursor', {'cursor': cursor, 'limit': limit}),
+                ('cursor + count', {
+                    'cursor': cursor, 'limit': limit, 'count': 'estimate'
+                }),
+            ):
+                def list_recipes():
+                    view(factory.get('/api/recipes/', params)).render()
+
+                self.report(
+                    f'{title}, страница {page}',
+                    *self.measure(list_recipes, options['repeat'])
+                )
@@ -0,0 +1,69 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.management.base_benchmark import BaseBenchmark
+from api.views import RecipeViewSet
+from recipe.models import Recipe
+
+
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class Command(BaseBenchmark):
+    help = 'Замер запросов и записей при PATCH /api/recipes/{id}/'
+    default_recipes = 10
+
+    def payload(self, recipe, components, tags):
+        return {
+            'name': recipe.name,
+            'text': recipe.text,
+            'cooking_time': recipe.cooking_time,
+            'tags': tags,
+            'ingredients': [
+                {'id': product_id, 'amount': amount}
+                for product_id, amount in components
+            ],
+        }
+
+    def benchmark(self, options):
+        factory = APIRequestFactory()
+        view = RecipeViewSet.as_view({'patch': 'partial_update'})
+        recipe = Recipe.objects.select_related('author').first()
+        components = list(
+            recipe.components.values_list('product_id', 'amount')
+        )
+        tags = list(recipe.tags.values_list('id', flat=True))
+        other_tag = next(tag.id for tag in self.tags if tag.id not in tags)
+        unused = next(
+            product_id for product_id in self.ingredients
+            if product_id not in dict(components)
+        )
+        changed_amount = [
+            (components[0][0], components[0][1] + 1), *components[1:]
+        ]
+        for title, payload in (
+            ('без изменений', self.payload(recipe, components, tags)),
+            ('изменено количество', self.payload(
+                recipe, changed_amount, tags
+            )),
+            ('заменён продукт и тег', self.payload(
+                recipe, [(unused, 1), *changed_amount[1:]],
+                [other_tag, *tags[1:]]
+            )),
+        ):
+            request = factory.patch(
+                f'/api/recipes/{recipe.id}/', payload, format='json'
+            )
+            force_authenticate(request, recipe.author)
+            with CaptureQueriesContext(connection) as queries:
+                response = view(request, pk=recipe.id)
+            writes = [
+                query['sql'] for query in queries.captured_queries
+                if query['sql'].lstrip().startswith(WRITE_STATEMENTS)
+            ]
+            self.stdout.write(
+                f'{title:<40} статус: {response.status_code}  '
+                f'запросов: {len(queries.captured_queries):>4}  '
+                f'изменяющих: {len(writes):>3}'
+            )
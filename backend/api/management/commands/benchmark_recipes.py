@@ -0,0 +1,33 @@
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.management.base_benchmark import BaseBenchmark
+from api.views import RecipeViewSet
+
+
+class Command(BaseBenchmark):
+    help = 'Замер количества запросов и времени ответа /api/recipes/'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--limits', type=int, nargs='+', default=(6, 50, 100),
+            help='Размеры страниц для замера'
+        )
+
+    def benchmark(self, options):
+        factory = APIRequestFactory()
+        view = RecipeViewSet.as_view({'get': 'list'})
+        for limit in options['limits']:
+            for user in (None, self.users[0]):
+                def list_recipes():
+                    request = factory.get('/api/recipes/', {'limit': limit})
+                    if user:
+                        force_authenticate(request, user)
+                    view(request).render()
+
+                self.report(
+                    '/api/recipes/?limit={} ({})'.format(
+                        limit, 'авторизован' if user else 'аноним'
+                    ),
+                    *self.measure(list_recipes, options['repeat'])
+                )
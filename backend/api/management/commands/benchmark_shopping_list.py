@@ -0,0 +1,47 @@
+from api import shopping_list
+from api.management.base_benchmark import BaseBenchmark
+from api.units import UNIT_FAMILIES
+from recipe.models import Cart, Ingredient, Recipe
+
+
+class Command(BaseBenchmark):
+    help = 'Замер выгрузки списка покупок для корзин разного размера'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--carts', type=int, nargs='+', default=(10, 100, 300),
+            help='Количество рецептов в корзине'
+        )
+
+    def seed(self, options):
+        super().seed(options)
+        units = [
+            unit for family in UNIT_FAMILIES.values() for unit in family
+        ]
+        for i, ingredient_id in enumerate(self.ingredients):
+            Ingredient.objects.filter(id=ingredient_id).update(
+                measurement_unit=units[i % len(units)]
+            )
+
+    def benchmark(self, options):
+        user = self.users[0]
+        recipe_ids = list(Recipe.objects.values_list('id', flat=True))
+        for size in options['carts']:
+            Cart.objects.filter(user=user).delete()
+            Cart.objects.bulk_create(
+                Cart(user=user, recipe_id=recipe_id)
+                for recipe_id in recipe_ids[:size]
+            )
+            for renderer_class in shopping_list.RENDERERS.values():
+                def export():
+                    for _ in renderer_class(
+                        shopping_list.get_ingredients(user),
+                        shopping_list.get_recipes(user)
+                    ).stream():
+                        pass
+
+                self.report(
+                    f'{renderer_class.format}, рецептов в корзине: {size}',
+                    *self.measure(export, options['repeat'])
+                )
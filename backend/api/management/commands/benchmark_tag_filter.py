@@ -0,0 +1,35 @@
+from api.filters import RecipeFilter
+from api.management.base_benchmark import BaseBenchmark
+from recipe.models import Recipe
+
+
+def filter_tags_or_distinct(recipes_set, tags):
+    response = recipes_set.none()
+    for tag in tags:
+        response |= recipes_set.filter(tags__slug=tag.slug)
+    return response.distinct()
+
+
+class Command(BaseBenchmark):
+    help = 'Сравнение фильтрации рецептов по тегам: OR + DISTINCT и IN'
+    default_recipes = 100_000
+
+    def benchmark(self, options):
+        recipe_filter = RecipeFilter()
+        for count in range(1, len(self.tags) + 1):
+            tags = self.tags[:count]
+            for title, filter_tags in (
+                ('OR + DISTINCT', filter_tags_or_distinct),
+                ('IN (подзапрос)', lambda recipes, tags: (
+                    recipe_filter.filter_tags(recipes, 'tags', tags)
+                )),
+            ):
+                def first_page():
+                    recipes = filter_tags(Recipe.objects.all(), tags)
+                    recipes.count()
+                    list(recipes[:6])
+
+                self.report(
+                    f'{title}, тегов: {count}',
+                    *self.measure(first_page, options['repeat'])
+                )
@@ -0,0 +1,125 @@
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.filters import RecipeFilter
+from api.ingredient_search import search_ingredients
+from api.querysets import annotate_is_subscribed, read_recipes
+from api.shopping_list import get_ingredients
+from recipe.models import Ingredient, Recipe, Tag, User
+
+
+SEQ_SCAN_PATTERNS = (
+    re.compile(r'Seq Scan on (?P<table>\w+)'),
+    re.compile(r'\bSCAN (?:TABLE )?(?P<table>\w+)\b(?! USING)'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет EXPLAIN для основных запросов API и сообщает '
+        'о последовательном чтении крупных таблиц'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold', type=int, default=1000,
+            help='Минимальный размер таблицы в строках для предупреждения'
+        )
+        parser.add_argument(
+            '--email', type=str, default=None,
+            help='Пользователь, от имени которого строятся запросы'
+        )
+        parser.add_argument(
+            '--verbose-plan', action='store_true',
+            help='Выводить планы запросов целиком'
+        )
+        parser.add_argument(
+            '--fail', action='store_true',
+            help='Завершаться с ошибкой при найденных проблемах'
+        )
+
+    def get_user(self, email):
+        users = User.objects.order_by('id')
+        user = users.filter(email=email).first() if email else users.first()
+        if user is None:
+            raise CommandError('В БД нет пользователей.')
+        return user
+
+    def hot_queries(self, user):
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        recipes = read_recipes(Recipe.objects.all(), user)
+        return {
+            'recipes-list': recipes[:page_size],
+            'recipes-list-author': recipes.filter(author=user)[:page_size],
+            'recipes-list-tags': RecipeFilter().filter_tags(
+                recipes, 'tags', list(Tag.objects.all()[:2])
+            )[:page_size],
+            'recipes-list-favorited': recipes.filter(
+                favorites__user=user
+            )[:page_size],
+            'recipes-list-in-cart': recipes.filter(
+                carts__user=user
+            )[:page_size],
+            'users-subscriptions': annotate_is_subscribed(
+                User.objects.filter(authors__user=user), user
+            )[:page_size],
+            'recipes-download-shopping-cart': get_ingredients(user),
+            'ingredients-list-search': search_ingredients(
+                Ingredient.objects.all(), 'мол'
+            ),
+        }
+
+    def table_sizes(self):
+        sizes = {}
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    "SELECT relname, reltuples::bigint FROM pg_class "
+                    "WHERE relkind = 'r'"
+                )
+                return dict(cursor.fetchall())
+            for table in connection.introspection.table_names(cursor):
+                cursor.execute(
+                    f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}'
+                )
+                sizes[table] = cursor.fetchone()[0]
+        return sizes
+
+    def seq_scans(self, plan):
+        for pattern in SEQ_SCAN_PATTERNS:
+            for match in pattern.finditer(plan):
+                yield match.group('table')
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['email'])
+        sizes = self.table_sizes()
+        problems = 0
+        for name, queryset in self.hot_queries(user).items():
+            if queryset.query.is_empty():
+                self.stdout.write(f'{name}: запрос к БД не выполняется')
+                continue
+            plan = queryset.explain()
+            if options['verbose_plan']:
+                self.stdout.write(f'{name}:\n{plan}\n')
+            large_scans = {
+                table: sizes.get(table, 0)
+                for table in self.seq_scans(plan)
+                if sizes.get(table, 0) >= options['threshold']
+            }
+            if not large_scans:
+                self.stdout.write(self.style.SUCCESS(f'{name}: OK'))
+                continue
+            problems += 1
+            self.stdout.write(self.style.WARNING(
+                '{}: последовательное чтение {}'.format(name, ', '.join(
+                    f'{table} ({size} строк)'
+                    for table, size in large_scans.items()
+                ))
+            ))
+        if problems and options['fail']:
+            raise CommandError(
+                f'Найдено запросов с последовательным чтением: {problems}'
+            )
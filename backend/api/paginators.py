@@ -1,8 +1,174 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class LimitPagePagination(PageNumberPagination):
     page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
     page_size_query_param = 'limit'
     max_page_size = 100
+
+
+def estimate_count(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return plan[0]['Plan']['Plan Rows']
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    count_exact = '1'
+    count_estimate = 'estimate'
+    page_size_query_param = LimitPagePagination.page_size_query_param
+    page_size = LimitPagePagination.page_size
+    max_page_size = LimitPagePagination.max_page_size
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def __init__(self, ordering=('-created_at', '-id')):
+        self.ordering = ordering
+
+    def get_page_size(self, request):
+        limit = request.query_params.get(self.page_size_query_param, '')
+        if limit.isdecimal() and int(limit) > 0:
+            return min(int(limit), self.max_page_size)
+        return self.page_size
+
+    def encode_cursor(self, reverse, values):
+        return urlsafe_b64encode(json.dumps(
+            (reverse, values), default=lambda value: value.isoformat()
+        ).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return False, None
+        try:
+            reverse, values = json.loads(urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return bool(reverse), [
+                model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (
+            TypeError, ValueError, BinasciiError, DjangoValidationError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_ordering(self, reverse):
+        if not reverse:
+            return self.ordering
+        return tuple(
+            name[1:] if name.startswith('-') else f'-{name}'
+            for name in self.ordering
+        )
+
+    @staticmethod
+    def after(ordering, values):
+        condition = Q()
+        for position, name in enumerate(ordering):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= Q(
+                **{
+                    previous.lstrip('-'): value
+                    for previous, value in zip(
+                        ordering[:position], values[:position]
+                    )
+                },
+                **{f'{field}__{lookup}': values[position]}
+            )
+        return condition
+
+    def position(self, instance):
+        return [
+            getattr(instance, name.lstrip('-')) for name in self.ordering
+        ]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        reverse, values = self.decode_cursor(request, queryset.model)
+        ordering = self.get_ordering(reverse)
+        page_size = self.get_page_size(request)
+        self.count = self.get_count(request, queryset)
+        if values is not None:
+            queryset = queryset.filter(self.after(ordering, values))
+        page = list(queryset.order_by(*ordering)[:page_size + 1])
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        if reverse:
+            page.reverse()
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+        self.page = page
+        return page
+
+    def get_count(self, request, queryset):
+        requested = request.query_params.get(self.count_query_param)
+        if requested is None:
+            return None
+        if requested == self.count_estimate:
+            return estimate_count(queryset)
+        if requested == self.count_exact:
+            return queryset.count()
+        raise ValidationError({self.count_query_param: (
+            f'Допустимые значения: {self.count_exact}, {self.count_estimate}.'
+        )})
+
+    def get_link(self, reverse, instance):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param,
+            self.encode_cursor(reverse, self.position(instance))
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.get_link(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.get_link(True, self.page[0])
+
+    def get_paginated_response(self, data):
+        response = OrderedDict((
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ))
+        if self.count is not None:
+            response['count'] = self.count
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,155 @@
+import codecs
+import re
+from string import ascii_letters, digits
+
+from django.conf import settings
+from django.core.files.uploadhandler import StopUpload
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.parsers import FileUploadParser, JSONParser
+from rest_framework.utils import json
+
+from api.uploads import SIZE_ERROR, Base64Decoder
+from recipe.constants import BASE64_CHUNK_SIZE
+
+
+STRUCTURE_RE = re.compile(r'["{}\[\]:,]')
+STRING_RE = re.compile(r'["\\]')
+BASE64_CHARS = frozenset(ascii_letters + digits + '+/=\n\r\t ')
+
+
+def incomplete_escape(buffer, position):
+    return buffer[position] == '\\' and len(buffer) - position < (
+        6 if buffer[position + 1:position + 2] == 'u' else 2
+    )
+
+
+class Base64JSONParser(JSONParser):
+    stream_fields = ('image', 'avatar')
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            data, files = self.split(stream, encoding)
+            parse_constant = json.strict_constant if self.strict else None
+            data = json.loads(data, parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+        if files:
+            data.update(files)
+        return data
+
+    def split(self, stream, encoding):
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            return self.scan(stream, decoder)
+        except ValidationError as error:
+            raise ValidationError({self.key: error.detail})
+
+    def scan(self, stream, decoder):
+        parts = []
+        files = {}
+        depth = 0
+        expect_key = False
+        self.key = None
+        string = None
+        image = None
+        buffer = ''
+        position = 0
+        eof = False
+        while True:
+            if position >= len(buffer) or incomplete_escape(buffer, position):
+                if eof:
+                    break
+                chunk = stream.read(BASE64_CHUNK_SIZE)
+                eof = not chunk
+                buffer = buffer[position:] + decoder.decode(chunk, final=eof)
+                position = 0
+                continue
+            if image is not None:
+                match = STRING_RE.search(buffer, position)
+                end = match.start() if match else len(buffer)
+                image.write(buffer[position:end])
+                position = end
+                if match is None:
+                    continue
+                if match.group() == '\\':
+                    if incomplete_escape(buffer, end):
+                        continue
+                    escape = buffer[end:end + (
+                        6 if buffer[end + 1] == 'u' else 2
+                    )]
+                    char = json.loads(f'"{escape}"')
+                    if char not in BASE64_CHARS:
+                        raise ValueError('Недопустимый символ в base64')
+                    image.write(char)
+                    position = end + len(escape)
+                    continue
+                files[self.key] = image.close()
+                image = None
+                parts.append('null')
+                position = end + 1
+            elif string is not None:
+                match = STRING_RE.search(buffer, position)
+                end = match.start() if match else len(buffer)
+                string.append(buffer[position:end])
+                position = end
+                if match is None:
+                    continue
+                if match.group() == '\\':
+                    if end + 1 == len(buffer):
+                        continue
+                    string.append(buffer[end:end + 2])
+                    position = end + 2
+                    continue
+                string.append('"')
+                text = ''.join(string)
+                if depth == 1 and expect_key:
+                    self.key = json.loads(text)
+                parts.append(text)
+                string = None
+                position = end + 1
+            else:
+                match = STRUCTURE_RE.search(buffer, position)
+                end = match.start() if match else len(buffer)
+                parts.append(buffer[position:end])
+                position = end
+                if match is None:
+                    continue
+                char = match.group()
+                position = end + 1
+                if char == '"':
+                    if (
+                        depth == 1 and not expect_key
+                        and self.key in self.stream_fields
+                    ):
+                        image = Base64Decoder()
+                    else:
+                        string = ['"']
+                    continue
+                parts.append(char)
+                if char in '{[':
+                    depth += 1
+                    expect_key = depth == 1 and char == '{'
+                elif char in '}]':
+                    depth -= 1
+                elif depth == 1:
+                    expect_key = char == ','
+        if string is not None or image is not None:
+            raise ValueError('Незавершённая строка')
+        return ''.join(parts), files
+
+
+class ImageUploadParser(FileUploadParser):
+    media_type = 'image/*'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return super().parse(stream, media_type, parser_context)
+        except StopUpload:
+            raise ValidationError(SIZE_ERROR)
+
+    def get_filename(self, stream, media_type, parser_context):
+        return super().get_filename(
+            stream, media_type, parser_context
+        ) or 'image'
@@ -0,0 +1,73 @@
+from django.db.models import Exists, OuterRef, Prefetch, Subquery
+
+from recipe.models import (
+    Cart,
+    Favorites,
+    Follow,
+    Recipe,
+    RecipeComponent,
+    User
+)
+
+
+SHORT_RECIPE_FIELDS = (
+    'id', 'name', 'image', 'image_renditions', 'cooking_time'
+)
+
+
+def annotate_is_subscribed(users, user):
+    if not user.is_authenticated:
+        return users
+    return users.annotate(is_subscribed=Exists(
+        Follow.objects.filter(user=user, following=OuterRef('pk'))
+    ))
+
+
+def annotate_user_flags(recipes, user):
+    if not user.is_authenticated:
+        return recipes
+    return recipes.annotate(
+        is_favorited=Exists(
+            Favorites.objects.filter(user=user, recipe=OuterRef('pk'))
+        ),
+        is_in_shopping_cart=Exists(
+            Cart.objects.filter(user=user, recipe=OuterRef('pk'))
+        ),
+    )
+
+
+def components_prefetch():
+    return Prefetch(
+        'components',
+        queryset=RecipeComponent.objects.select_related(
+            'product'
+        ).order_by('product__name')
+    )
+
+
+def read_recipes(recipes, user):
+    return annotate_user_flags(recipes, user).prefetch_related(
+        Prefetch(
+            'author',
+            queryset=annotate_is_subscribed(User.objects.all(), user)
+        ),
+        'tags',
+        components_prefetch(),
+    )
+
+
+def short_recipes(recipes):
+    return recipes.only(*SHORT_RECIPE_FIELDS)
+
+
+def recipes_preview(limit):
+    latest_ids = Recipe.objects.filter(
+        author=OuterRef('author')
+    ).order_by('-created_at').values('id')[:limit]
+    return Prefetch(
+        'recipes',
+        queryset=Recipe.objects.filter(
+            id__in=Subquery(latest_ids)
+        ).only(*SHORT_RECIPE_FIELDS, 'author'),
+        to_attr='preview_recipes'
+    )
@@ -1,9 +1,10 @@
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from djoser.serializers import UserSerializer as DjoserUserSerializer
-
-from drf_extra_fields.fields import Base64ImageField
 from rest_framework import serializers
 
 from recipe.constants import MIN_INGREDIENT_AMOUNT
+from recipe.ingredient_index import ingredient_index
 from recipe.models import (
     Cart,
     Favorites,
@@ -14,31 +15,46 @@ from recipe.models import (
     Tag,
     User
 )
+from api.fields import (
+    Base64ImageField,
+    BulkListSerializer,
+    BulkPrimaryKeyRelatedField,
+    RenditionsField
+)
+from api.instrumentation import TimedSerializerMixin
+from api.querysets import SHORT_RECIPE_FIELDS, components_prefetch
 from api.validators import (
     validate_image,
     validate_products,
+    validate_required_fields,
     validate_tags,
 )
 
 
-class UserSerializer(DjoserUserSerializer):
+class UserSerializer(TimedSerializerMixin, DjoserUserSerializer):
     is_subscribed = serializers.SerializerMethodField()
+    avatar_renditions = RenditionsField()
 
     class Meta(DjoserUserSerializer.Meta):
-        fields = (*DjoserUserSerializer.Meta.fields, 'is_subscribed', 'avatar')
+        fields = (
+            *DjoserUserSerializer.Meta.fields, 'is_subscribed', 'avatar',
+            'avatar_renditions'
+        )
 
     def get_is_subscribed(self, author):
         request = self.context.get('request')
-        return (
-            request
-            and request.user.is_authenticated
-            and Follow.objects.filter(
-                user=request.user, following=author
-            ).exists()
-        )
-
-
-class AvatarSerializer(serializers.ModelSerializer):
+        if not (request and request.user.is_authenticated):
+            return False
+        if hasattr(author, 'is_subscribed'):
+            return author.is_subscribed
+        if author == request.user:
+            return False
+        return Follow.objects.filter(
+            user=request.user, following=author
+        ).exists()
+
+
+class AvatarSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     avatar = Base64ImageField()
 
     class Meta:
@@ -49,18 +65,23 @@ class AvatarSerializer(serializers.ModelSerializer):
         return validate_image(avatar)
 
     def update(self, instance, validated_data):
-        avatar = validated_data.pop('avatar', None)
-        if instance.avatar:
-            instance.avatar.delete(save=False)
-        instance.avatar = avatar
+        instance.avatar = validated_data.pop('avatar', None)
         instance.save()
         return instance
 
 
+class RecipeImageSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    image = Base64ImageField()
+
+    class Meta:
+        model = Recipe
+        fields = ('image',)
+
+    def validate_image(self, image):
+        return validate_image(image)
+
+
 class SubscriptionReaderSerializer(UserSerializer):
-    recipes_count = serializers.IntegerField(
-        source='recipes.count', read_only=True
-    )
     recipes = serializers.SerializerMethodField()
 
     class Meta(UserSerializer.Meta):
@@ -69,15 +90,13 @@ class SubscriptionReaderSerializer(UserSerializer):
         )
 
     def get_recipes(self, obj):
-        return ReadShortRecipeSerializer(
-            obj.recipes.all()[
-                :int(self.context.get('request').GET.get(
-                    'recipes_limit', 10**10
-                ))
-            ], many=True).data
+        recipes = getattr(obj, 'preview_recipes', None)
+        if recipes is None:
+            recipes = obj.recipes.all()[:self.context['recipes_limit']]
+        return ReadShortRecipeSerializer(recipes, many=True).data
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Ingredient
@@ -85,82 +104,98 @@ class IngredientSerializer(serializers.ModelSerializer):
 
 
 class RecipeIngredientSerializer(serializers.ModelSerializer):
-    amount = serializers.SerializerMethodField()
+    id = serializers.IntegerField(source='product.id')
+    name = serializers.CharField(source='product.name')
+    measurement_unit = serializers.CharField(
+        source='product.measurement_unit'
+    )
 
     class Meta:
-        model = Ingredient
-        fields = ('id', 'name', 'measurement_unit', 'amount')
-
-    def get_amount(self, obj):
-        recipe_id = self.context.get('recipe_id')
-        recipe_component = RecipeComponent.objects.get(
-            recipe_id=recipe_id, product=obj)
-        return recipe_component.amount
+        model = RecipeComponent
+        fields = read_only_fields = (
+            'id', 'name', 'measurement_unit', 'amount'
+        )
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = '__all__'
 
 
-class ReadShortRecipeSerializer(serializers.ModelSerializer):
+class ReadShortRecipeSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
+    image_renditions = RenditionsField()
+
     class Meta:
         model = Recipe
-        fields = read_only_fields = ('id', 'name', 'image', 'cooking_time')
+        fields = read_only_fields = SHORT_RECIPE_FIELDS
 
 
-class ReadRecipeSerializer(serializers.ModelSerializer):
+class ReadRecipeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     tags = TagSerializer(many=True)
     author = UserSerializer()
-    ingredients = serializers.SerializerMethodField()
+    ingredients = RecipeIngredientSerializer(source='components', many=True)
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
+    image_renditions = RenditionsField()
 
     class Meta:
         model = Recipe
         fields = read_only_fields = (
             'id', 'tags', 'author', 'ingredients', 'is_favorited',
-            'is_in_shopping_cart', 'name', 'image', 'text', 'cooking_time'
+            'is_in_shopping_cart', 'name', 'image', 'image_renditions',
+            'text', 'cooking_time'
         )
 
-    def is_exists(self, recipe, model):
-        if (
+    def is_exists(self, recipe, model, flag):
+        if not (
             (request := self.context.get('request'))
             and request.user.is_authenticated
         ):
-            return model.objects.filter(
-                user=request.user, recipe=recipe).exists()
-        return False
+            return False
+        if hasattr(recipe, flag):
+            return getattr(recipe, flag)
+        return model.objects.filter(
+            user=request.user, recipe=recipe).exists()
 
     def get_is_favorited(self, recipe):
-        return self.is_exists(recipe, Favorites)
+        return self.is_exists(recipe, Favorites, 'is_favorited')
 
     def get_is_in_shopping_cart(self, recipe):
-        return self.is_exists(recipe, Cart)
+        return self.is_exists(recipe, Cart, 'is_in_shopping_cart')
+
 
-    def get_ingredients(self, obj):
-        components = obj.components.all()
-        ingredients = [component.product for component in components]
-        return RecipeIngredientSerializer(
-            ingredients, many=True, context={'recipe_id': obj.id}
-        ).data
+class CookableRecipeSerializer(ReadRecipeSerializer):
+    matched_ingredients = serializers.IntegerField()
+    total_ingredients = serializers.IntegerField()
+    coverage = serializers.FloatField()
+
+    class Meta(ReadRecipeSerializer.Meta):
+        fields = read_only_fields = (
+            *ReadRecipeSerializer.Meta.fields,
+            'matched_ingredients', 'total_ingredients', 'coverage'
+        )
 
 
 class WriteRecipeIngredientSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(queryset=Ingredient.objects.all())
+    id = BulkPrimaryKeyRelatedField(queryset=Ingredient.objects.all())
     amount = serializers.IntegerField(min_value=MIN_INGREDIENT_AMOUNT)
 
     class Meta:
         model = RecipeComponent
         fields = ('id', 'amount')
+        list_serializer_class = BulkListSerializer
 
 
-class RecipeCreatePatchSerializer(serializers.ModelSerializer):
+class RecipeCreatePatchSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
     ingredients = WriteRecipeIngredientSerializer(
         many=True
     )
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = BulkPrimaryKeyRelatedField(
         queryset=Tag.objects.all(),
         many=True
     )
@@ -180,30 +215,67 @@ class RecipeCreatePatchSerializer(serializers.ModelSerializer):
     def validate_tags(self, tags):
         return validate_tags(tags)
 
-    def _handle_ingredients(self, recipe, ingredients_data):
-        recipe.components.all().delete()
-        RecipeComponent.objects.bulk_create(
+    def validate(self, data):
+        validate_required_fields(data, ('ingredients', 'tags'))
+        return data
+
+    def _handle_ingredients(self, recipe, ingredients_data, created=False):
+        amounts = {
+            ingredient_data['id'].id: ingredient_data['amount']
+            for ingredient_data in ingredients_data
+        }
+        existing = {} if created else {
+            component.product_id: component
+            for component in RecipeComponent.objects.filter(
+                recipe=recipe
+            ).only('id', 'product_id', 'amount')
+        }
+        removed = [
+            component.id for product_id, component in existing.items()
+            if product_id not in amounts
+        ]
+        changed = []
+        for product_id, component in existing.items():
+            amount = amounts.get(product_id, component.amount)
+            if amount != component.amount:
+                component.amount = amount
+                changed.append(component)
+        added = [
             RecipeComponent(
-                recipe=recipe,
-                product=ingredient_data['id'],
-                amount=ingredient_data['amount']
+                recipe=recipe, product_id=product_id, amount=amount
             )
-            for ingredient_data in ingredients_data
-        )
-
+            for product_id, amount in amounts.items()
+            if product_id not in existing
+        ]
+        if removed:
+            RecipeComponent.objects.filter(id__in=removed).delete()
+        if changed:
+            RecipeComponent.objects.bulk_update(changed, ('amount',))
+        if added:
+            RecipeComponent.objects.bulk_create(added)
+        if removed or added:
+            ingredient_index.update_recipe_on_commit(recipe.id, amounts)
+
+    @transaction.atomic
     def create(self, validated_data):
         ingredients_data = validated_data.pop('ingredients')
         tags_data = validated_data.pop('tags')
         validated_data['author'] = self.context['request'].user
         recipe = super().create(validated_data)
         recipe.tags.set(tags_data)
-        self._handle_ingredients(recipe, ingredients_data)
+        self._handle_ingredients(recipe, ingredients_data, created=True)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         ingredients_data = validated_data.pop('ingredients')
+        tags_data = validated_data.pop('tags')
         self._handle_ingredients(instance, ingredients_data)
+        instance.tags.set(tags_data)
         return super().update(instance, validated_data)
 
     def to_representation(self, instance):
+        prefetch_related_objects(
+            [instance], 'author', 'tags', components_prefetch()
+        )
         return ReadRecipeSerializer(instance, context=self.context).data
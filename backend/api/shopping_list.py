@@ -1,24 +1,154 @@
+import codecs
+import csv
 from datetime import datetime
+from tempfile import SpooledTemporaryFile
 
+from django.conf import settings
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
 
-def generate_txt_shopping_list(ingredients, recipes):
-    current_date = datetime.now().strftime('%d-%m-%Y')
-    ingredients_lines = [
-        '{}. {}/{}: {}'.format(
-            i,
-            item['product__name'].capitalize(),
-            item['product__measurement_unit'],
-            item['amount'],
-        )
-        for i, item in enumerate(ingredients, start=1)
-    ]
-    recipes_lines = [
-        f'- {recipe.name} ({recipe.author})' for recipe in recipes
-    ]
-    return '\n'.join([
-        f'Дата составления списка: {current_date}',
-        'Список продуктов:',
-        *ingredients_lines,
-        'Рецепты:',
-        *recipes_lines
-    ])
+from api.units import aggregate_ingredients, humanize
+from backend.metrics import SHOPPING_LIST_BYTES
+from recipe.constants import DESCRIPTION_LENGTH
+from recipe.models import Recipe, RecipeComponent
+
+
+CHUNK_SIZE = 64 * 1024
+PDF_FONT_NAME = 'Arial'
+PDF_FONT_PATH = settings.BASE_DIR / 'static' / 'fonts' / 'arial.ttf'
+PDF_FONT_SIZE = 11
+PDF_MARGIN = 40
+
+
+def get_ingredients(user):
+    return aggregate_ingredients(
+        RecipeComponent.objects.filter(recipe__carts__user=user)
+    )
+
+
+def get_recipes(user):
+    return Recipe.objects.filter(
+        carts__user=user
+    ).order_by('name').values_list('name', 'author__username')
+
+
+class ShoppingListRenderer:
+    format = None
+    content_type = None
+
+    def __init__(self, ingredients, recipes):
+        self.ingredients = ingredients
+        self.recipes = recipes
+        self.date = datetime.now().strftime('%d-%m-%Y')
+
+    @property
+    def filename(self):
+        return f'shopping_list.{self.format}'
+
+    def ingredient_rows(self):
+        for i, item in enumerate(self.ingredients.iterator(), start=1):
+            amount, unit = humanize(item['amount'], item['measurement_unit'])
+            yield i, item['name'].capitalize(), unit, amount
+
+    def ingredient_lines(self):
+        for row in self.ingredient_rows():
+            yield '{}. {}/{}: {}'.format(*row)
+
+    def recipe_lines(self):
+        for name, author in self.recipes.iterator():
+            yield f'- {name} ({author[:DESCRIPTION_LENGTH]})'
+
+    def lines(self):
+        yield f'Дата составления списка: {self.date}'
+        yield 'Список продуктов:'
+        yield from self.ingredient_lines()
+        yield 'Рецепты:'
+        yield from self.recipe_lines()
+
+    def stream(self):
+        raise NotImplementedError
+
+    def measured_stream(self):
+        size = 0
+        for chunk in self.stream():
+            size += len(chunk)
+            yield chunk
+        SHOPPING_LIST_BYTES.labels(self.format).observe(size)
+
+
+class TxtRenderer(ShoppingListRenderer):
+    format = 'txt'
+    content_type = 'text/plain; charset=utf-8'
+
+    def stream(self):
+        lines = self.lines()
+        yield next(lines).encode()
+        for line in lines:
+            yield f'\n{line}'.encode()
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class CsvRenderer(ShoppingListRenderer):
+    format = 'csv'
+    content_type = 'text/csv; charset=utf-8'
+
+    def rows(self):
+        yield ('№', 'Продукт', 'Единица измерения', 'Количество')
+        yield from self.ingredient_rows()
+        yield ()
+        yield ('Рецепт', 'Автор')
+        for name, author in self.recipes.iterator():
+            yield (name, author[:DESCRIPTION_LENGTH])
+
+    def stream(self):
+        writer = csv.writer(Echo())
+        yield codecs.BOM_UTF8
+        for row in self.rows():
+            yield writer.writerow(row).encode()
+
+
+class PdfRenderer(ShoppingListRenderer):
+    format = 'pdf'
+    content_type = 'application/pdf'
+
+    @staticmethod
+    def register_font():
+        if PDF_FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(PDF_FONT_NAME, str(PDF_FONT_PATH)))
+
+    def draw(self, output):
+        self.register_font()
+        _, height = A4
+        line_height = PDF_FONT_SIZE * 1.5
+        document = canvas.Canvas(output, pagesize=A4)
+        document.setTitle('Список покупок')
+        text = None
+        for line in self.lines():
+            if text is None or text.getY() < PDF_MARGIN:
+                if text is not None:
+                    document.drawText(text)
+                    document.showPage()
+                text = document.beginText(PDF_MARGIN, height - PDF_MARGIN)
+                text.setFont(PDF_FONT_NAME, PDF_FONT_SIZE, line_height)
+            text.textLine(line)
+        document.drawText(text)
+        document.save()
+
+    def stream(self):
+        with SpooledTemporaryFile(max_size=CHUNK_SIZE * 16) as output:
+            self.draw(output)
+            output.seek(0)
+            while chunk := output.read(CHUNK_SIZE):
+                yield chunk
+
+
+RENDERERS = {
+    renderer.format: renderer
+    for renderer in (TxtRenderer, CsvRenderer, PdfRenderer)
+}
@@ -0,0 +1,48 @@
+from rest_framework.test import APIClient, APITestCase
+
+from recipe.models import Ingredient, Recipe, RecipeComponent, Tag, User
+
+
+class FoodgramTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = cls.create_user('author')
+        cls.reader = cls.create_user('reader')
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {i}', slug=f'tag-{i}')
+            for i in range(3)
+        ]
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'Продукт {i}', measurement_unit='г')
+            for i in range(20)
+        )
+        cls.ingredients = list(Ingredient.objects.order_by('pk'))
+
+    @staticmethod
+    def create_user(username):
+        return User.objects.create_user(
+            username=username, email=f'{username}@example.com',
+            password='password', first_name=username, last_name=username
+        )
+
+    @classmethod
+    def create_recipe(cls, author=None, ingredients=3, tags=1, **fields):
+        recipe = Recipe.objects.create(
+            author=author or cls.author, name=fields.pop('name', 'Рецепт'),
+            text='Описание', cooking_time=10, image='recipes/image.png',
+            **fields
+        )
+        recipe.tags.set(cls.tags[:tags])
+        RecipeComponent.objects.bulk_create(
+            RecipeComponent(recipe=recipe, product=product, amount=i + 1)
+            for i, product in enumerate(cls.ingredients[:ingredients])
+        )
+        return recipe
+
+    @staticmethod
+    def client_for(user=None):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client
@@ -0,0 +1,25 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+
+@override_settings(ALLOWED_HOSTS=['localhost'])
+class BenchmarkCommandsTest(TestCase):
+    commands = (
+        'benchmark_recipes',
+        'benchmark_pagination',
+        'benchmark_recipe_update',
+        'benchmark_shopping_list',
+        'benchmark_tag_filter',
+    )
+
+    def test_commands_run_with_default_allowed_hosts(self):
+        for command in self.commands:
+            with self.subTest(command=command):
+                output = StringIO()
+                call_command(
+                    command, recipes=20, ingredients=3, repeat=1,
+                    stdout=output
+                )
+                self.assertIn('запросов', output.getvalue())
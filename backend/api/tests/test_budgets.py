@@ -0,0 +1,133 @@
+import base64
+import io
+import tempfile
+
+from django.conf import settings
+from django.test import override_settings
+from PIL import Image
+
+from api.instrumentation import BudgetExceeded, endpoint_stats
+from api.tests.base import FoodgramTestCase
+from recipe.models import Cart, Follow
+
+
+def image_data():
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), 'red').save(buffer, 'PNG')
+    return 'data:image/png;base64,' + base64.b64encode(
+        buffer.getvalue()
+    ).decode()
+
+
+QUERY_BUDGETS = {
+    endpoint: {
+        name: limit for name, limit in budget.items()
+        if name != 'duration_ms'
+    }
+    for endpoint, budget in settings.ENDPOINT_BUDGETS.items()
+}
+
+
+@override_settings(
+    ENDPOINT_BUDGETS=QUERY_BUDGETS, ENDPOINT_BUDGETS_STRICT=True
+)
+class EndpointBudgetTest(FoodgramTestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        endpoint_stats.reset()
+        for _ in range(8):
+            recipe = self.create_recipe(ingredients=10, tags=3)
+            Cart.objects.create(user=self.reader, recipe=recipe)
+        Follow.objects.create(user=self.reader, following=self.author)
+        self.recipe = recipe
+        self.client = self.client_for(self.reader)
+
+    def recipe_data(self):
+        return {
+            'name': 'Рецепт', 'text': 'Описание', 'cooking_time': 10,
+            'image': image_data(), 'tags': [tag.pk for tag in self.tags],
+            'ingredients': [
+                {'id': product.pk, 'amount': 1}
+                for product in self.ingredients[:10]
+            ],
+        }
+
+    def test_budgeted_endpoints_stay_within_budget(self):
+        responses = (
+            self.client.get('/api/recipes/'),
+            self.client.get(f'/api/recipes/{self.recipe.pk}/'),
+            self.client.get('/api/users/subscriptions/'),
+            self.client.get('/api/tags/'),
+            self.client.get('/api/ingredients/?name=Про'),
+        )
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/recipes/download_shopping_cart/')
+        self.assertTrue(b''.join(response.streaming_content))
+        response = self.client.post(
+            '/api/recipes/', self.recipe_data(), format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        data = self.recipe_data()
+        data['ingredients'] = data['ingredients'][5:] + [
+            {'id': product.pk, 'amount': 2}
+            for product in self.ingredients[10:15]
+        ]
+        response = self.client.patch(
+            f'/api/recipes/{response.json()["id"]}/', data, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        stats = endpoint_stats.snapshot()
+        for endpoint in QUERY_BUDGETS:
+            if ' ' in endpoint:
+                self.assertEqual(stats[endpoint]['count'], 1, endpoint)
+
+    @override_settings(
+        ENDPOINT_BUDGETS={'GET api:recipes-list': {'queries': 1}}
+    )
+    def test_breached_query_budget_raises(self):
+        with self.assertRaisesMessage(BudgetExceeded, 'queries='):
+            self.client.get('/api/recipes/')
+
+    @override_settings(
+        ENDPOINT_BUDGETS={'api:recipes-detail': {'queries': 1}},
+        ENDPOINT_BUDGETS_STRICT=False
+    )
+    def test_breached_budget_logs_warning_when_not_strict(self):
+        with self.assertLogs('api.instrumentation', 'WARNING'):
+            response = self.client.get(f'/api/recipes/{self.recipe.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            endpoint_stats.snapshot()['GET api:recipes-detail'][
+                'over_budget'
+            ],
+            1
+        )
+
+
+class SerializerTimingTest(FoodgramTestCase):
+
+    def setUp(self):
+        endpoint_stats.reset()
+
+    def serializer_ms(self, endpoint):
+        return endpoint_stats.snapshot()[endpoint]['serializer_ms_sum']
+
+    def test_api_serializers_are_timed(self):
+        self.create_recipe()
+        response = self.client_for(self.reader).get('/api/recipes/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.serializer_ms('GET api:recipes-list'), 0)
+
+    def test_third_party_serializers_are_not_timed(self):
+        response = self.client_for().post('/api/auth/token/login/', {
+            'email': self.reader.email, 'password': 'password'
+        })
+        self.assertEqual(response.status_code, 200)
+        [endpoint] = endpoint_stats.snapshot()
+        self.assertEqual(self.serializer_ms(endpoint), 0)
@@ -0,0 +1,33 @@
+from rest_framework.authtoken.models import Token
+
+from api.tests.base import FoodgramTestCase
+
+
+class MetricsAccessTest(FoodgramTestCase):
+    accept = 'application/openmetrics-text; version=1.0.0,text/plain;q=0.5'
+
+    def get_metrics(self, client):
+        return client.get('/metrics', HTTP_ACCEPT=self.accept)
+
+    def test_anonymous_is_rejected(self):
+        self.assertEqual(self.get_metrics(self.client_for()).status_code, 401)
+
+    def test_regular_user_is_rejected(self):
+        response = self.get_metrics(self.client_for(self.reader))
+        self.assertEqual(response.status_code, 403)
+
+    def test_admin_token_reads_metrics(self):
+        admin = self.create_user('admin')
+        admin.is_staff = True
+        admin.save()
+        token = Token.objects.create(user=admin)
+        client = self.client_for()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        client.get('/api/tags/')
+        response = self.get_metrics(client)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(
+            b'foodgram_http_requests_total{method="GET",'
+            b'route="api:tags-list"', response.content
+        )
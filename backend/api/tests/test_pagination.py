@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.tests.base import FoodgramTestCase
+
+
+class KeysetPaginationTest(FoodgramTestCase):
+
+    def setUp(self):
+        for _ in range(3):
+            self.create_recipe()
+        self.client = self.client_for()
+
+    def test_exact_count(self):
+        response = self.client.get('/api/recipes/?cursor=&count=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 3)
+
+    def test_count_is_omitted_without_parameter(self):
+        response = self.client.get('/api/recipes/?cursor=')
+        self.assertNotIn('count', response.json())
+
+    def test_unknown_count_value_is_rejected(self):
+        for value in ('0', 'true', 'yes'):
+            with self.subTest(count=value):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(
+                        f'/api/recipes/?cursor=&count={value}'
+                    )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('count', response.json())
+                self.assertFalse(any(
+                    'COUNT(' in query['sql'] for query in queries
+                ))
+
+    def test_user_cursor_follows_page_ordering(self):
+        for name in ('carol', 'bob', 'alice'):
+            self.create_user(name)
+        expected = [
+            user['username']
+            for user in self.client.get('/api/users/?limit=100').json()[
+                'results'
+            ]
+        ]
+        usernames = []
+        url = '/api/users/?cursor=&limit=2'
+        while url:
+            page = self.client.get(url).json()
+            usernames += [user['username'] for user in page['results']]
+            url = page['next']
+        self.assertEqual(usernames, expected)
@@ -0,0 +1,55 @@
+import base64
+import io
+import json
+import os
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+
+from api.parsers import Base64JSONParser
+
+
+def wrap(text, separator, width=76):
+    return separator.join(
+        text[start:start + width] for start in range(0, len(text), width)
+    )
+
+
+class Base64JSONParserTest(SimpleTestCase):
+    content = os.urandom(1000)
+    encoded = base64.b64encode(content).decode()
+
+    def parse(self, body, chunk_size=64 * 1024):
+        with mock.patch('api.parsers.BASE64_CHUNK_SIZE', chunk_size):
+            return Base64JSONParser().parse(io.BytesIO(body.encode()))
+
+    def assert_decoded(self, body):
+        for chunk_size in (5, 64 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                data = self.parse(body, chunk_size)
+                self.assertEqual(data['name'], 'Борщ')
+                self.assertEqual(data['image'].read(), self.content)
+
+    def test_plain_base64(self):
+        self.assert_decoded(json.dumps(
+            {'name': 'Борщ', 'image': self.encoded}, ensure_ascii=False
+        ))
+
+    def test_mime_wrapped_base64(self):
+        for separator in ('\n', '\r\n'):
+            with self.subTest(separator=separator):
+                self.assert_decoded(json.dumps({
+                    'image': wrap(self.encoded, separator), 'name': 'Борщ'
+                }))
+
+    def test_escaped_base64_characters(self):
+        body = json.dumps({'name': 'Борщ', 'image': self.encoded})
+        body = body.replace('/', '\\/').replace('A', '\\u0041')
+        self.assert_decoded(body)
+
+    def test_escape_outside_base64_alphabet_is_rejected(self):
+        for escape in ('\\"', '\\\\', '\\b', '\\u00e9'):
+            with self.subTest(escape=escape):
+                with self.assertRaises(ParseError):
+                    self.parse(f'{{"image": "{self.encoded[:8]}{escape}"}}')
@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.tests.base import FoodgramTestCase
+
+
+class RecipeReadQueriesTest(FoodgramTestCase):
+    list_queries = 5
+    detail_queries = 4
+
+    def setUp(self):
+        self.create_recipe()
+        self.create_recipe(author=self.reader)
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def grow(self):
+        for _ in range(4):
+            self.create_recipe(ingredients=15, tags=3)
+            self.create_recipe(author=self.reader, ingredients=10, tags=2)
+
+    def assert_constant(self, url, expected):
+        for user in (None, self.reader):
+            with self.subTest(authenticated=user is not None):
+                client = self.client_for(user)
+                before = self.count_queries(client, url)
+                self.grow()
+                after = self.count_queries(client, url)
+                self.assertEqual(before, expected)
+                self.assertEqual(after, expected)
+
+    def test_list_queries_do_not_grow_with_recipes(self):
+        self.assert_constant('/api/recipes/', self.list_queries)
+
+    def test_detail_queries_do_not_grow_with_ingredients(self):
+        small = self.create_recipe(ingredients=1, tags=1)
+        large = self.create_recipe(
+            ingredients=len(self.ingredients), tags=len(self.tags)
+        )
+        for user in (None, self.reader):
+            with self.subTest(authenticated=user is not None):
+                client = self.client_for(user)
+                for recipe in (small, large):
+                    self.assertEqual(
+                        self.count_queries(
+                            client, f'/api/recipes/{recipe.pk}/'
+                        ),
+                        self.detail_queries
+                    )
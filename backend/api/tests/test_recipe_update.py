@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import RecipeCreatePatchSerializer
+from api.tests.base import FoodgramTestCase
+
+
+class RecipeUpdateTest(FoodgramTestCase):
+
+    def setUp(self):
+        self.recipe = self.create_recipe(ingredients=3, tags=2)
+        self.components = {
+            component.product_id: component
+            for component in self.recipe.components.all()
+        }
+        self.client = self.client_for(self.author)
+        self.url = f'/api/recipes/{self.recipe.pk}/'
+
+    def handle_ingredients(self, amounts):
+        with CaptureQueriesContext(connection) as queries:
+            RecipeCreatePatchSerializer()._handle_ingredients(
+                self.recipe, [
+                    {'id': product, 'amount': amount}
+                    for product, amount in amounts
+                ]
+            )
+        return [query['sql'] for query in queries]
+
+    def statements(self, queries, statement):
+        return [sql for sql in queries if sql.startswith(statement)]
+
+    def test_unchanged_ingredients_are_not_written(self):
+        queries = self.handle_ingredients(
+            (product, index + 1)
+            for index, product in enumerate(self.ingredients[:3])
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0].startswith('SELECT'))
+
+    def test_diff_touches_only_changed_rows(self):
+        kept, changed, removed = self.ingredients[:3]
+        added = self.ingredients[3]
+        queries = self.handle_ingredients(
+            ((kept, 1), (changed, 20), (added, 5))
+        )
+        self.assertEqual(len(queries), 4)
+        [delete] = self.statements(queries, 'DELETE')
+        [update] = self.statements(queries, 'UPDATE')
+        [insert] = self.statements(queries, 'INSERT')
+        self.assertIn(f'IN ({self.components[removed.pk].pk})', delete)
+        self.assertIn(f'IN ({self.components[changed.pk].pk})', update)
+        self.assertNotIn('UNION ALL', insert)
+        self.assertNotIn('), (', insert)
+        components = {
+            component.product_id: component
+            for component in self.recipe.components.all()
+        }
+        self.assertEqual(set(components), {kept.pk, changed.pk, added.pk})
+        self.assertEqual(
+            components[kept.pk].pk, self.components[kept.pk].pk
+        )
+        self.assertEqual(
+            components[changed.pk].pk, self.components[changed.pk].pk
+        )
+        self.assertEqual(components[changed.pk].amount, 20)
+        self.assertEqual(components[added.pk].amount, 5)
+
+    def assert_rejected(self, data, field):
+        response = self.client.patch(self.url, {
+            'name': 'Новое название', **data
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(field, response.json())
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.name, 'Рецепт')
+        self.assertEqual(
+            set(self.recipe.tags.values_list('pk', flat=True)),
+            {tag.pk for tag in self.tags[:2]}
+        )
+        self.assertEqual(
+            set(self.recipe.components.values_list('pk', 'amount')),
+            {
+                (component.pk, component.amount)
+                for component in self.components.values()
+            }
+        )
+
+    def test_patch_without_tags_is_rejected(self):
+        self.assert_rejected(
+            {'ingredients': [{'id': self.ingredients[0].pk, 'amount': 7}]},
+            'tags'
+        )
+
+    def test_patch_without_ingredients_is_rejected(self):
+        self.assert_rejected({'tags': [self.tags[2].pk]}, 'ingredients')
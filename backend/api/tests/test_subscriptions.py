@@ -0,0 +1,22 @@
+from api.tests.base import FoodgramTestCase
+from recipe.models import Follow
+
+
+class SubscribeTest(FoodgramTestCase):
+
+    def test_invalid_recipes_limit_does_not_subscribe(self):
+        client = self.client_for(self.reader)
+        url = f'/api/users/{self.author.pk}/subscribe/'
+        response = client.post(f'{url}?recipes_limit=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Follow.objects.exists())
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+        response = client.post(f'{url}?recipes_limit=1')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            Follow.objects.filter(
+                user=self.reader, following=self.author
+            ).count(),
+            1
+        )
@@ -0,0 +1,66 @@
+from django.db.models import (
+    Case,
+    CharField,
+    F,
+    FloatField,
+    Sum,
+    Value,
+    When
+)
+
+
+UNIT_FAMILIES = {
+    'г': {'г': 1, 'гр': 1, 'кг': 1000, 'мг': 0.001},
+    'мл': {
+        'мл': 1, 'л': 1000, 'капля': 0.05, 'ч. л.': 5, 'ст. л.': 15,
+        'стакан': 250,
+    },
+    'шт.': {'шт.': 1, 'шт': 1},
+}
+LARGER_UNITS = {'г': ('кг', 1000), 'мл': ('л', 1000)}
+
+
+def canonical_unit(field):
+    return Case(
+        *(
+            When(**{f'{field}__in': tuple(units)}, then=Value(canonical))
+            for canonical, units in UNIT_FAMILIES.items()
+        ),
+        default=F(field),
+        output_field=CharField()
+    )
+
+
+def conversion_factor(field):
+    return Case(
+        *(
+            When(**{field: unit}, then=Value(factor))
+            for units in UNIT_FAMILIES.values()
+            for unit, factor in units.items()
+            if factor != 1
+        ),
+        default=Value(1.0),
+        output_field=FloatField()
+    )
+
+
+def aggregate_ingredients(components):
+    unit_field = 'product__measurement_unit'
+    return components.values(
+        name=F('product__name'),
+        measurement_unit=canonical_unit(unit_field),
+    ).annotate(
+        amount=Sum(
+            F('amount') * conversion_factor(unit_field),
+            output_field=FloatField()
+        )
+    ).order_by('name', 'measurement_unit')
+
+
+def humanize(amount, unit):
+    if unit in LARGER_UNITS:
+        larger_unit, factor = LARGER_UNITS[unit]
+        if amount >= factor:
+            amount, unit = amount / factor, larger_unit
+    amount = f'{amount:.2f}'.rstrip('0').rstrip('.').replace('.', ',')
+    return amount, unit
@@ -0,0 +1,123 @@
+import binascii
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from functools import lru_cache
+from tempfile import SpooledTemporaryFile
+from threading import BoundedSemaphore
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from PIL import Image
+from rest_framework.exceptions import Throttled, ValidationError
+
+from backend.metrics import submit_tracked
+from recipe.constants import (
+    BASE64_CHUNK_SIZE,
+    DATA_URI_MAX_LENGTH,
+    IMAGE_VERIFY_QUEUE_SIZE,
+    IMAGE_VERIFY_TIMEOUT
+)
+
+
+MAX_DECODED_SIZE = settings.MAX_UPLOAD_SIZE * 1024 * 1024
+MAX_ENCODED_SIZE = (MAX_DECODED_SIZE + 2) // 3 * 4
+SIZE_ERROR = f'Максимальный размер файла {settings.MAX_UPLOAD_SIZE}MB.'
+INVALID_BASE64 = 'Некорректная строка base64.'
+
+verify_slots = BoundedSemaphore(IMAGE_VERIFY_QUEUE_SIZE)
+
+
+class Base64Decoder:
+
+    def __init__(self):
+        self.file = SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+            dir=settings.FILE_UPLOAD_TEMP_DIR
+        )
+        self.pending = ''
+        self.header = True
+        self.encoded_size = 0
+        self.content_type = None
+
+    def write(self, text):
+        self.encoded_size += len(text)
+        if self.encoded_size > MAX_ENCODED_SIZE + DATA_URI_MAX_LENGTH:
+            raise ValidationError(SIZE_ERROR)
+        text = self.pending + ''.join(text.split())
+        if self.header:
+            if not text.startswith('data:'[:len(text)]):
+                self.header = False
+            elif ',' in text:
+                header, text = text.split(',', 1)
+                self.content_type = header[5:].split(';', 1)[0] or None
+                self.header = False
+            elif len(text) > DATA_URI_MAX_LENGTH:
+                raise ValidationError(INVALID_BASE64)
+            else:
+                self.pending = text
+                return
+        usable = len(text) - len(text) % 4
+        self.pending = text[usable:]
+        self.decode(text[:usable])
+
+    def decode(self, text):
+        try:
+            self.file.write(binascii.a2b_base64(text))
+        except binascii.Error:
+            raise ValidationError(INVALID_BASE64)
+
+    def close(self):
+        if self.pending:
+            self.decode(self.pending + '=' * (-len(self.pending) % 4))
+            self.pending = ''
+        size = self.file.tell()
+        if size > MAX_DECODED_SIZE:
+            raise ValidationError(SIZE_ERROR)
+        self.file.seek(0)
+        return UploadedFile(
+            self.file, name='image', content_type=self.content_type,
+            size=size
+        )
+
+
+def decode_base64(data):
+    if len(data) > MAX_ENCODED_SIZE + DATA_URI_MAX_LENGTH:
+        raise ValidationError(SIZE_ERROR)
+    decoder = Base64Decoder()
+    for start in range(0, len(data), BASE64_CHUNK_SIZE):
+        decoder.write(data[start:start + BASE64_CHUNK_SIZE])
+    return decoder.close()
+
+
+def verify_image(file):
+    file.seek(0)
+    try:
+        with Image.open(file) as image:
+            image_format = image.format
+            image.verify()
+    except Exception:
+        return None
+    finally:
+        file.seek(0)
+    return image_format
+
+
+@lru_cache(maxsize=None)
+def get_verify_pool():
+    return ThreadPoolExecutor(
+        max_workers=settings.IMAGE_VERIFY_WORKERS,
+        thread_name_prefix='image-verify'
+    )
+
+
+def run_verification(file):
+    if not verify_slots.acquire(timeout=IMAGE_VERIFY_TIMEOUT):
+        raise Throttled(
+            detail='Слишком много загружаемых изображений,'
+                   ' повторите запрос позже.'
+        )
+    future = submit_tracked('verify', get_verify_pool(), verify_image, file)
+    future.add_done_callback(lambda future: verify_slots.release())
+    try:
+        return future.result(timeout=IMAGE_VERIFY_TIMEOUT)
+    except TimeoutError:
+        return None
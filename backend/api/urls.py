@@ -10,6 +10,7 @@ from api.views import (
     UserViewSet,
     RecipeViewSet,
     TagViewSet,
+    instrumentation_view,
     redoc_view
 )
 
@@ -26,6 +27,9 @@ urlpatterns = [
     path('', include(router.urls)),
     path('auth/', include('djoser.urls.authtoken')),
     path('docs/', redoc_view, name='redoc'),
+    path(
+        'instrumentation/', instrumentation_view, name='instrumentation'
+    ),
 ]
 
 schema_view = get_schema_view(
@@ -1,3 +1,5 @@
+from collections import Counter
+
 from django.core.exceptions import ValidationError
 
 
@@ -22,7 +24,9 @@ def validate_unique_items(items, item_name):
             item, dict
         ) else item.name for item in items
     ]
-    duplicate_items = set([item for item in names if names.count(item) > 1])
+    duplicate_items = [
+        name for name, count in Counter(names).items() if count > 1
+    ]
     if duplicate_items:
         duplicate_items_str = [str(item) for item in duplicate_items]
         raise ValidationError(
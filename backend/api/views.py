@@ -1,43 +1,132 @@
-from django.db.models import Sum
-from django.http import FileResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet as DjoserUserViewSet
 from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.exceptions import ValidationError
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import (
+    IsAdminUser,
     IsAuthenticated,
     IsAuthenticatedOrReadOnly
 )
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from api import shopping_list
 from api.filters import IngredientFilter, RecipeFilter
+from api.instrumentation import endpoint_stats
+from api.paginators import KeysetPagination
+from api.parsers import Base64JSONParser, ImageUploadParser
 from api.permissions import IsAuthorOrAdmin
+from api.querysets import (
+    annotate_is_subscribed,
+    read_recipes,
+    recipes_preview,
+    short_recipes
+)
 from api.serializers import (
     AvatarSerializer,
+    CookableRecipeSerializer,
     IngredientSerializer,
     ReadShortRecipeSerializer,
     RecipeCreatePatchSerializer,
+    RecipeImageSerializer,
     SubscriptionReaderSerializer,
     TagSerializer
 )
+from backend.metrics import render_metrics
+from recipe.cache import reference_cache
+from recipe.constants import COOKABLE_INGREDIENTS_MAX, RECIPES_LIMIT_MAX
+from recipe.ingredient_index import ingredient_index
 from recipe.models import (
     Cart,
     Favorites,
     Follow,
     Ingredient,
     Recipe,
-    RecipeComponent,
     Tag,
     User
 )
 
 
-class UserViewSet(DjoserUserViewSet):
+IMAGE_PARSERS = (Base64JSONParser, MultiPartParser, ImageUploadParser)
+
+
+class IgnoreFormatContentNegotiation(DefaultContentNegotiation):
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+def get_recipes_limit(request):
+    recipes_limit = request.query_params.get(
+        'recipes_limit', str(RECIPES_LIMIT_MAX)
+    )
+    if not recipes_limit.isdecimal():
+        raise ValidationError(
+            {'recipes_limit': 'Должно быть целым неотрицательным числом.'}
+        )
+    return min(int(recipes_limit), RECIPES_LIMIT_MAX)
+
+
+def get_image_data(request, field):
+    return {field: request.data.get(field, request.data.get('file'))}
+
+
+def get_ingredient_ids(request):
+    ingredient_ids = {
+        value.strip()
+        for param in request.query_params.getlist('ingredients')
+        for value in param.split(',')
+        if value.strip()
+    }
+    if not ingredient_ids:
+        raise ValidationError(
+            {'ingredients': 'Укажите id имеющихся ингредиентов.'}
+        )
+    if not all(pk.isdecimal() for pk in ingredient_ids):
+        raise ValidationError(
+            {'ingredients': 'Id ингредиентов должны быть целыми числами.'}
+        )
+    if len(ingredient_ids) > COOKABLE_INGREDIENTS_MAX:
+        raise ValidationError({'ingredients': (
+            f'Можно указать не больше {COOKABLE_INGREDIENTS_MAX} '
+            'ингредиентов.'
+        )})
+    return {int(pk) for pk in ingredient_ids}
+
+
+class KeysetPaginationMixin:
+    keyset_ordering = ('-created_at', '-id')
+    keyset_actions = ('list',)
+
+    @property
+    def paginator(self):
+        if (
+            not hasattr(self, '_paginator')
+            and self.action in self.keyset_actions
+            and KeysetPagination.cursor_query_param
+            in self.request.query_params
+        ):
+            self._paginator = KeysetPagination(self.keyset_ordering)
+        return super().paginator
+
+
+class UserViewSet(KeysetPaginationMixin, DjoserUserViewSet):
     http_method_names = ('get', 'post', 'put', 'delete')
+    keyset_ordering = ('username', 'id')
+    keyset_actions = ('list', 'get_subscriptions')
+
+    def get_queryset(self):
+        return annotate_is_subscribed(
+            super().get_queryset(), self.request.user
+        )
 
     @action(
         detail=False, methods=['get'], url_path='me',
@@ -48,16 +137,19 @@ class UserViewSet(DjoserUserViewSet):
 
     @action(
         detail=False, methods=['put', 'delete'], url_path='me/avatar',
-        permission_classes=(IsAuthenticated,),
+        permission_classes=(IsAuthenticated,), parser_classes=IMAGE_PARSERS
     )
     def avatar(self, request):
         user = request.user
         if request.method == 'PUT':
-            serializers = AvatarSerializer(user, data=request.data)
+            serializers = AvatarSerializer(
+                user, data=get_image_data(request, 'avatar')
+            )
             serializers.is_valid(raise_exception=True)
             serializers.save()
             return Response(serializers.data, status=status.HTTP_200_OK)
-        user.avatar.delete(save=True)
+        user.avatar = None
+        user.save()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -65,11 +157,16 @@ class UserViewSet(DjoserUserViewSet):
         permission_classes=(IsAuthenticated,)
     )
     def get_subscriptions(self, request):
-        subscriptions = User.objects.filter(authors__user=request.user)
+        recipes_limit = get_recipes_limit(request)
+        subscriptions = annotate_is_subscribed(
+            User.objects.filter(authors__user=request.user), request.user
+        ).prefetch_related(recipes_preview(recipes_limit))
         page = self.paginate_queryset(subscriptions)
         return self.get_paginated_response(
             SubscriptionReaderSerializer(
-                page, many=True, context={'request': request}
+                page, many=True, context={
+                    'request': request, 'recipes_limit': recipes_limit
+                }
             ).data
         )
 
@@ -83,6 +180,7 @@ class UserViewSet(DjoserUserViewSet):
         author = get_object_or_404(User, id=id)
         user = request.user
         if request.method == 'POST':
+            recipes_limit = get_recipes_limit(request)
             if author == user:
                 raise ValidationError({'error': 'Нельзя подписаться на себя.'})
             _, created = Follow.objects.get_or_create(
@@ -93,7 +191,9 @@ class UserViewSet(DjoserUserViewSet):
                     {'error': f'Вы уже подписаны на пользователя {author}.'})
             return Response(
                 SubscriptionReaderSerializer(
-                    author, context={'request': request}
+                    author, context={
+                        'request': request, 'recipes_limit': recipes_limit
+                    }
                 ).data, status=status.HTTP_201_CREATED
             )
         follow = get_object_or_404(Follow, user=user, following=author)
@@ -101,18 +201,28 @@ class UserViewSet(DjoserUserViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(KeysetPaginationMixin, viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrAdmin,)
     http_method_names = ('get', 'post', 'patch', 'delete')
     serializer_class = RecipeCreatePatchSerializer
+    parser_classes = (Base64JSONParser, FormParser, MultiPartParser)
+
+    def get_queryset(self):
+        recipes = super().get_queryset()
+        if self.action in ('list', 'retrieve', 'cookable'):
+            return read_recipes(recipes, self.request.user)
+        if self.action in ('partial_update', 'destroy'):
+            return recipes.select_related('author')
+        if self.action in ('favorite', 'shopping_cart'):
+            return short_recipes(recipes)
+        return recipes
 
-    @staticmethod
-    def handle_favorite_or_cart(request, model, pk):
+    def handle_favorite_or_cart(self, request, model, pk):
         category = model._meta.verbose_name
-        recipe = get_object_or_404(Recipe, pk=pk)
+        recipe = get_object_or_404(self.get_queryset(), pk=pk)
         if request.method == 'POST':
             obj, created = model.objects.get_or_create(
                 user=request.user, recipe=recipe
@@ -130,6 +240,42 @@ class RecipeViewSet(viewsets.ModelViewSet):
         obj.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=('get',), url_path='cookable')
+    def cookable(self, request):
+        rows = self.paginate_queryset(ingredient_index.coverage(
+            get_ingredient_ids(request),
+            containing_all=request.query_params.get('all') == '1'
+        ))
+        recipes = self.get_queryset().in_bulk(
+            [row.recipe_id for row in rows]
+        )
+        page = []
+        for row in rows:
+            if (recipe := recipes.get(row.recipe_id)) is None:
+                continue
+            recipe.matched_ingredients = row.matched
+            recipe.total_ingredients = row.total
+            recipe.coverage = round(row.matched / row.total, 2)
+            page.append(recipe)
+        return self.get_paginated_response(
+            CookableRecipeSerializer(
+                page, many=True, context=self.get_serializer_context()
+            ).data
+        )
+
+    @action(
+        detail=True, methods=('patch',), url_path='image',
+        parser_classes=IMAGE_PARSERS
+    )
+    def image(self, request, pk):
+        serializer = RecipeImageSerializer(
+            self.get_object(), data=get_image_data(request, 'image'),
+            context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['get'], url_path='get-link')
     def get_link(self, request, pk):
         if not Recipe.objects.filter(pk=pk).exists():
@@ -154,43 +300,83 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
     @action(
         detail=False, methods=('get',), url_path='download_shopping_cart',
-        permission_classes=(IsAuthenticated,)
+        permission_classes=(IsAuthenticated,),
+        content_negotiation_class=IgnoreFormatContentNegotiation
     )
     def download_shopping_cart(self, request):
-        return FileResponse(
-            shopping_list.generate_txt_shopping_list(
-                RecipeComponent.objects.filter(
-                    recipe__carts__user=request.user
-                ).values(
-                    'product__name', 'product__measurement_unit'
-                ).annotate(
-                    amount=Sum('amount')
-                ).order_by('product__name'),
-                Recipe.objects.filter(
-                    carts__user=request.user
-                ).all().order_by('name')
-            ),
-            content_type='text/plain',
-            headers={
-                'Content-Disposition':
-                'attachment; filename="shopping_list.txt"'
-            }
+        export_format = request.query_params.get(
+            'format', shopping_list.TxtRenderer.format
+        )
+        if export_format not in shopping_list.RENDERERS:
+            raise ValidationError({'format': 'Доступные форматы: {}.'.format(
+                ', '.join(shopping_list.RENDERERS)
+            )})
+        renderer = shopping_list.RENDERERS[export_format](
+            shopping_list.get_ingredients(request.user),
+            shopping_list.get_recipes(request.user)
+        )
+        response = StreamingHttpResponse(
+            renderer.measured_stream(), content_type=renderer.content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{renderer.filename}"'
         )
+        return response
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class CachedListMixin:
+
+    def is_list_cacheable(self, request):
+        return True
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_list_cacheable(request):
+            return super().list(request, *args, **kwargs)
+        entry = reference_cache.get(
+            self.queryset.model, self.basename,
+            lambda: self.get_serializer(self.get_queryset(), many=True).data
+        )
+        response = get_conditional_response(
+            request, etag=entry.etag, last_modified=entry.created_at
+        )
+        if response is None:
+            response = Response(entry.data)
+        response['ETag'] = entry.etag
+        response['Last-Modified'] = http_date(entry.created_at)
+        return response
+
+
+class TagViewSet(CachedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(CachedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     pagination_class = None
     filter_backends = (DjangoFilterBackend,)
     filterset_class = IngredientFilter
 
+    def is_list_cacheable(self, request):
+        return not request.query_params.get('name')
+
 
 def redoc_view(request):
     return render(request, 'redoc.html')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def instrumentation_view(request):
+    return Response(endpoint_stats.snapshot())
+
+
+class MetricsView(APIView):
+    permission_classes = (IsAdminUser,)
+    content_negotiation_class = IgnoreFormatContentNegotiation
+
+    def get(self, request):
+        content, content_type = render_metrics()
+        return HttpResponse(content, content_type=content_type)
@@ -0,0 +1,63 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+
+REQUESTS = Counter(
+    'foodgram_http_requests', 'Обработанные HTTP-запросы',
+    ('route', 'method', 'status')
+)
+REQUEST_DURATION = Histogram(
+    'foodgram_http_request_duration_seconds', 'Время обработки запроса',
+    ('route', 'method')
+)
+DB_QUERIES = Histogram(
+    'foodgram_db_queries', 'Количество SQL-запросов за HTTP-запрос',
+    ('route', 'method'), buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+CACHE_REQUESTS = Counter(
+    'foodgram_cache_requests', 'Обращения к кешу по пространствам имён',
+    ('namespace', 'result')
+)
+SHOPPING_LIST_BYTES = Histogram(
+    'foodgram_shopping_list_bytes', 'Размер выгруженного списка покупок',
+    ('format',), buckets=(1024, 4096, 16384, 65536, 262144, 1048576)
+)
+IMAGE_QUEUE = Gauge(
+    'foodgram_image_queue_depth',
+    'Изображения в очереди и в обработке у пулов потоков',
+    ('pool',), multiprocess_mode='livesum'
+)
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics():
+    return generate_latest(get_registry()), CONTENT_TYPE_LATEST
+
+
+def submit_tracked(pool_name, pool, function, *args):
+    gauge = IMAGE_QUEUE.labels(pool_name)
+    gauge.inc()
+    try:
+        future = pool.submit(function, *args)
+    except Exception:
+        gauge.dec()
+        raise
+    future.add_done_callback(lambda future: gauge.dec())
+    return future
@@ -27,7 +27,6 @@ INSTALLED_APPS += [
     'rest_framework',
     'rest_framework.authtoken',
     'djoser',
-    'debug_toolbar',
     'django_filters',
     'drf_yasg',
     'drf_spectacular',
@@ -39,6 +38,7 @@ INSTALLED_APPS += [
 ]
 
 MIDDLEWARE = [
+    'api.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -46,9 +46,12 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+if DEBUG:
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -88,6 +91,31 @@ else:
         }
     }
 
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+elif os.getenv('CACHE_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'foodgram',
+        }
+    }
+
+CACHES['default']['KEY_PREFIX'] = os.getenv('CACHE_KEY_PREFIX', 'foodgram')
+CACHES['default']['TIMEOUT'] = int(os.getenv('CACHE_TIMEOUT', 300))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -149,13 +177,31 @@ DJOSER = {
 }
 
 MAX_UPLOAD_SIZE = 10
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', 2))
+IMAGE_VERIFY_WORKERS = int(os.getenv('IMAGE_VERIFY_WORKERS', 2))
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+DEFAULT_FILE_STORAGE = 'recipe.storage.ContentAddressedStorage'
 
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
 
+SERVER_TIMING = os.getenv('SERVER_TIMING', default=str(DEBUG)) == 'True'
+ENDPOINT_BUDGETS_STRICT = (
+    os.getenv('ENDPOINT_BUDGETS_STRICT', default='False') == 'True'
+)
+ENDPOINT_BUDGETS = {
+    'GET api:recipes-list': {'queries': 8, 'duration_ms': 500},
+    'GET api:recipes-detail': {'queries': 6, 'duration_ms': 300},
+    'POST api:recipes-list': {'queries': 20, 'duration_ms': 1000},
+    'PATCH api:recipes-detail': {'queries': 20, 'duration_ms': 1000},
+    'GET api:users-get-subscriptions': {'queries': 6, 'duration_ms': 500},
+    'GET api:recipes-download-shopping-cart': {'queries': 4},
+    'api:tags-list': {'queries': 2},
+    'api:ingredients-list': {'queries': 4},
+}
+
 HASHIDS_SALT = os.getenv('SECRET_KEY', default='default_secret_key')
 HASHIDS_MIN_LENGTH = 6
 
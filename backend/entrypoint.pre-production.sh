@@ -3,5 +3,9 @@ python manage.py migrate --no-input
 sleep 5
 python manage.py collectstatic --no-input
 cp -r collected_static/. ../backend_static/backend_static/
-python manage.py loaddata fixtures_db.json
+python manage.py fastload fixtures_db.json
+python manage.py render_images
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
 gunicorn --bind 0.0.0.0:8000 backend.wsgi
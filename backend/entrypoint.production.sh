@@ -1,3 +1,6 @@
 python manage.py collectstatic --no-input
 cp -r collected_static/. ../backend_static/backend_static/
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
 gunicorn --bind 0.0.0.0:8000 backend.wsgi
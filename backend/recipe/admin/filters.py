@@ -71,11 +71,11 @@ class HasValueFilter(admin.SimpleListFilter):
     def lookups(self, request, model_admin):
         return self.LOOKUPS
 
-    def queryset(self, request, queryset, field):
+    def queryset(self, request, queryset, counter):
         if self.value() == 'yes':
-            return queryset.filter(**{f'{field}__isnull': False}).distinct()
+            return queryset.filter(**{f'{counter}__gt': 0})
         if self.value() == 'no':
-            return queryset.filter(**{f'{field}__isnull': True})
+            return queryset.filter(**{counter: 0})
         return queryset
 
 
@@ -84,7 +84,7 @@ class HasRecipesFilter(HasValueFilter):
     parameter_name = 'has_recipes'
 
     def queryset(self, request, queryset):
-        return super().queryset(request, queryset, 'recipes')
+        return super().queryset(request, queryset, 'recipes_count')
 
 
 class HasSubscriptionsFilter(HasValueFilter):
@@ -92,7 +92,7 @@ class HasSubscriptionsFilter(HasValueFilter):
     parameter_name = 'has_subscriptions'
 
     def queryset(self, request, queryset):
-        return super().queryset(request, queryset, 'followers')
+        return super().queryset(request, queryset, 'following_count')
 
 
 class HasFollowersFilter(HasValueFilter):
@@ -100,4 +100,4 @@ class HasFollowersFilter(HasValueFilter):
     parameter_name = 'has_followers'
 
     def queryset(self, request, queryset):
-        return super().queryset(request, queryset, 'authors')
+        return super().queryset(request, queryset, 'followers_count')
@@ -2,6 +2,7 @@ import os
 
 from django.conf import settings
 from django.contrib import admin
+from django.core.files.storage import default_storage
 from django.db.models import Count
 from django.utils.safestring import mark_safe
 
@@ -24,6 +25,13 @@ class DisplayImageMixin:
     @admin.display(description='Изображение')
     def display_image(self, obj, image_field='image'):
         image = getattr(obj, image_field, None)
+        thumbnail = getattr(obj, f'{image_field}_renditions', {}).get(
+            'files', {}
+        ).get('thumbnail')
+        if image and thumbnail:
+            return get_img(
+                default_storage.url(thumbnail['webp']), DISPLAY_IMAGE_SIZE
+            )
         if image and hasattr(image, 'url'):
             file_path = os.path.join(settings.MEDIA_ROOT, image.name)
             if os.path.exists(file_path):
@@ -52,23 +60,6 @@ class DisplayImageMixin:
                     if os.path.exists(file_path):
                         return get_img(image.url, DISPLAY_IMAGE_SIZE)
 
-    def save_model(self, request, obj, form, change, field_name='image'):
-        if change:
-            old_instance = self.model.objects.get(pk=obj.pk)
-            old_file = getattr(old_instance, field_name, None)
-            if old_file and old_file != getattr(obj, field_name, None):
-                old_file.delete(save=False)
-        obj.save()
-
-    def delete_model(self, request, obj, field_name='image'):
-        if obj_file := getattr(obj, field_name, None):
-            obj_file.delete(save=False)
-        obj.delete()
-
-    def delete_queryset(self, request, queryset, field_name='image'):
-        for obj in queryset:
-            self.delete_model(request, obj)
-
 
 class RecipesAdminMixin:
     list_display: tuple[str, ...] = ('get_recipes_count',)
@@ -5,6 +5,7 @@ from django.utils.safestring import mark_safe
 from recipe.admin.filters import CookingTimeFilter
 from recipe.admin.mixins import DisplayImageMixin, RecipesAdminMixin
 from recipe.constants import ITEMS_PER_PAGE
+from recipe.ingredient_index import ingredient_index
 from recipe.models import RecipeComponent
 
 
@@ -19,7 +20,7 @@ class RecipeAdmin(DisplayImageMixin, BaseAdmin):
     )
     list_display = (
         'name', 'display_image', 'tag_list', 'author', 'cooking_time',
-        'ingredient_list', 'get_favorites_count'
+        'ingredient_list', 'favorites_count'
     )
     list_filter = ('tags', 'author', CookingTimeFilter)
     search_fields = ('author__username', 'name', 'tags__name')
@@ -52,9 +53,9 @@ class RecipeAdmin(DisplayImageMixin, BaseAdmin):
             'tags', 'components__product'
         )
 
-    @admin.display(description='Понравилось')
-    def get_favorites_count(self, recipe):
-        return recipe.favorites.count()
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        ingredient_index.reload_recipe_on_commit(form.instance.id)
 
 
 class RecipeIngredientInline(admin.TabularInline):
@@ -6,13 +6,14 @@ from recipe.admin.filters import (
     HasFollowersFilter, HasRecipesFilter, HasSubscriptionsFilter)
 from recipe.admin.mixins import DisplayImageMixin
 from recipe.constants import ITEMS_PER_PAGE
+from recipe.counters import count_subquery
 from recipe.models import Cart, Favorites, Follow
 
 
 class UserAdmin(DisplayImageMixin, UserAdmin):
     list_display = (
         'username', 'display_avatar', 'email', 'get_full_name',
-        'recipes_count', 'followers_count', 'following_count',
+        'recipes_count', 'following_count', 'followers_count',
         'favorites_count', 'cart_count'
     )
     fieldsets = (
@@ -53,34 +54,19 @@ class UserAdmin(DisplayImageMixin, UserAdmin):
     def get_full_name(self, user):
         return f'{user.last_name} {user.first_name}'
 
-    @admin.display(description='Рецепты')
-    def recipes_count(self, obj):
-        return obj.recipes.all().count()
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            favorites_total=count_subquery(Favorites, 'user'),
+            cart_total=count_subquery(Cart, 'user'),
+        )
 
-    @admin.display(description='Понравилось')
-    def favorites_count(self, obj):
-        return obj.favorites.all().count()
+    @admin.display(description='Понравилось', ordering='favorites_total')
+    def favorites_count(self, user):
+        return user.favorites_total
 
-    @admin.display(description='Корзина')
+    @admin.display(description='Корзина', ordering='cart_total')
     def cart_count(self, user):
-        return user.carts.all().count()
-
-    @admin.display(description='Подписки')
-    def followers_count(self, users):
-        return users.followers.count()
-
-    @admin.display(description='Подписчики')
-    def following_count(self, users):
-        return users.authors.count()
-
-    def save_model(self, request, obj, form, change):
-        super().save_model(request, obj, form, change, field_name='avatar')
-
-    def delete_model(self, request, obj):
-        super().delete_model(request, obj, field_name='avatar')
-
-    def delete_queryset(self, request, queryset):
-        super().delete_queryset(request, queryset, field_name='avatar')
+        return user.cart_total
 
 
 @admin.register(Follow)
@@ -8,6 +8,9 @@ class RecipeConfig(AppConfig):
     name = 'recipe'
     verbose_name = 'Рецепты'
 
+    def ready(self):
+        import recipe.signals  # noqa: F401
+
 
 class AdminSite(AdminSite):
     site_header = 'Управление приложением FOODGRAM'
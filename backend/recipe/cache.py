@@ -0,0 +1,145 @@
+import hashlib
+import json
+import time
+from collections import Counter, namedtuple
+from threading import Lock
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.dispatch import Signal
+
+from backend.metrics import CACHE_REQUESTS
+from recipe.constants import REFERENCE_CACHE_TIMEOUT
+
+
+reference_data_changed = Signal()
+
+CacheEntry = namedtuple(
+    'CacheEntry', ('version', 'created_at', 'etag', 'data')
+)
+MISSING = object()
+
+
+class NamespacedCache:
+
+    def __init__(self, alias=DEFAULT_CACHE_ALIAS):
+        self.alias = alias
+        self.hits = Counter()
+        self.misses = Counter()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def version_key(namespace):
+        return f'{namespace}:version'
+
+    def get_version(self, namespace):
+        key = self.version_key(namespace)
+        version = self.cache.get(key)
+        if version is None:
+            version = self.new_version()
+            self.cache.add(key, version, timeout=None)
+            version = self.cache.get(key, version)
+        return version
+
+    @staticmethod
+    def new_version():
+        return time.time_ns() // 1000
+
+    def invalidate(self, namespace):
+        key = self.version_key(namespace)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            version = self.new_version()
+            self.cache.add(key, version, timeout=None)
+            return self.cache.get(key, version)
+
+    def record(self, namespace, hit):
+        (self.hits if hit else self.misses)[namespace] += 1
+        CACHE_REQUESTS.labels(namespace, 'hit' if hit else 'miss').inc()
+
+    def get(self, namespace, key, default=None):
+        value = self.cache.get(
+            f'{namespace}:{key}', MISSING,
+            version=self.get_version(namespace)
+        )
+        self.record(namespace, value is not MISSING)
+        return default if value is MISSING else value
+
+    def set(self, namespace, key, value, timeout=None):
+        self.cache.set(
+            f'{namespace}:{key}', value, timeout,
+            version=self.get_version(namespace)
+        )
+
+    def get_or_set(self, namespace, key, build, timeout=None):
+        version = self.get_version(namespace)
+        value = self.cache.get(f'{namespace}:{key}', MISSING, version=version)
+        self.record(namespace, value is not MISSING)
+        if value is MISSING:
+            value = build()
+            self.cache.set(
+                f'{namespace}:{key}', value, timeout, version=version
+            )
+        return value
+
+    def stats(self):
+        return {
+            namespace: {
+                'hits': self.hits[namespace],
+                'misses': self.misses[namespace],
+            }
+            for namespace in self.hits.keys() | self.misses.keys()
+        }
+
+
+namespaced_cache = NamespacedCache()
+
+
+class ReferenceCache:
+
+    def __init__(self, cache=namespaced_cache,
+                 timeout=REFERENCE_CACHE_TIMEOUT):
+        self.cache = cache
+        self.timeout = timeout
+        self.lock = Lock()
+        self.entries = {}
+
+    @staticmethod
+    def namespace(model):
+        return model._meta.label_lower
+
+    @staticmethod
+    def make_etag(data):
+        return '"{}"'.format(hashlib.md5(json.dumps(
+            data, ensure_ascii=False, sort_keys=True, default=str
+        ).encode()).hexdigest())
+
+    def get(self, model, key, build):
+        namespace = self.namespace(model)
+        version = self.cache.get_version(namespace)
+        entry = self.entries.get((namespace, key))
+        if (
+            entry is not None
+            and entry.version == version
+            and time.time() - entry.created_at < self.timeout
+        ):
+            self.cache.record(namespace, hit=True)
+            return entry
+        self.cache.record(namespace, hit=False)
+        with self.lock:
+            data = build()
+            entry = CacheEntry(
+                version, int(time.time()), self.make_etag(data), data
+            )
+            self.entries[(namespace, key)] = entry
+        return entry
+
+    def invalidate(self, model):
+        self.cache.invalidate(self.namespace(model))
+        reference_data_changed.send(sender=model)
+
+
+reference_cache = ReferenceCache()
@@ -11,3 +11,24 @@ MIN_INGREDIENT_AMOUNT = 1
 TIME_MIN_VALUE = 1
 DISPLAY_IMAGE_SIZE = 100
 ITEMS_PER_PAGE = 20
+INGREDIENT_SEARCH_LIMIT = 50
+REFERENCE_CACHE_TIMEOUT = 300
+RECIPES_LIMIT_MAX = 100
+LEMMA_MAX_LENGTH = 64
+COOKABLE_INGREDIENTS_MAX = 100
+RENDITION_QUALITY = 80
+RENDITION_FORMATS = (('webp', 'WEBP'), ('jpeg', 'JPEG'))
+RECIPE_RENDITIONS = {
+    'card': (640, 480, True),
+    'detail': (1280, 1280, False),
+    'thumbnail': (DISPLAY_IMAGE_SIZE * 2, DISPLAY_IMAGE_SIZE * 2, True),
+}
+AVATAR_RENDITIONS = {
+    'card': (96, 96, True),
+    'detail': (400, 400, True),
+    'thumbnail': (DISPLAY_IMAGE_SIZE * 2, DISPLAY_IMAGE_SIZE * 2, True),
+}
+BASE64_CHUNK_SIZE = 64 * 1024
+DATA_URI_MAX_LENGTH = 256
+IMAGE_VERIFY_QUEUE_SIZE = 8
+IMAGE_VERIFY_TIMEOUT = 10
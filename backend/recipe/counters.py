@@ -0,0 +1,46 @@
+from django.apps import apps as global_apps
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+COUNTERS = (
+    ('recipe.Favorites', 'recipe', 'recipe.Recipe', 'favorites_count'),
+    ('recipe.Recipe', 'author', 'recipe.User', 'recipes_count'),
+    ('recipe.Follow', 'following', 'recipe.User', 'followers_count'),
+    ('recipe.Follow', 'user', 'recipe.User', 'following_count'),
+)
+
+
+def change_counters(instance, delta):
+    label = instance._meta.label
+    for source, field, target, counter in COUNTERS:
+        if source != label:
+            continue
+        global_apps.get_model(target).objects.filter(
+            pk=getattr(instance, f'{field}_id')
+        ).update(**{counter: Greatest(F(counter) + delta, 0)})
+
+
+def count_subquery(source, field):
+    return Coalesce(Subquery(
+        source.objects.filter(
+            **{field: OuterRef('pk')}
+        ).order_by().values(field).annotate(
+            total=Count('pk')
+        ).values('total')
+    ), 0)
+
+
+def recount(apps=global_apps):
+    fixed = {}
+    for source, field, target, counter in COUNTERS:
+        source = apps.get_model(source)
+        target = apps.get_model(target)
+        actual = count_subquery(source, field)
+        drifted = target.objects.annotate(actual=actual).exclude(
+            **{counter: F('actual')}
+        ).values('pk')
+        fixed[f'{target._meta.label}.{counter}'] = target.objects.filter(
+            pk__in=Subquery(drifted)
+        ).update(**{counter: actual})
+    return fixed
@@ -0,0 +1,177 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+from backend.metrics import submit_tracked
+from recipe.constants import (
+    AVATAR_RENDITIONS,
+    RECIPE_RENDITIONS,
+    RENDITION_FORMATS,
+    RENDITION_QUALITY
+)
+from recipe.models import Recipe, User
+
+
+RENDITIONS_DIR = 'renditions'
+IMAGE_FIELDS = {
+    Recipe: ('image', RECIPE_RENDITIONS),
+    User: ('avatar', AVATAR_RENDITIONS),
+}
+SAVE_OPTIONS = {
+    'JPEG': {'optimize': True, 'progressive': True},
+    'WEBP': {'method': 4},
+}
+
+logger = logging.getLogger(__name__)
+rendition_storage = FileSystemStorage()
+
+
+def renditions_field(field):
+    return f'{field}_renditions'
+
+
+def rendition_path(source, name, extension):
+    return f'{RENDITIONS_DIR}/{os.path.splitext(source)[0]}/{name}.{extension}'
+
+
+def rendition_paths(files):
+    return {
+        path for formats in files.values() for path in formats.values()
+    }
+
+
+def prepare(image):
+    image = ImageOps.exif_transpose(image)
+    has_alpha = (
+        image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+    )
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def resize(image, width, height, crop):
+    if crop:
+        return ImageOps.fit(image, (width, height), Image.LANCZOS)
+    image = image.copy()
+    image.thumbnail((width, height), Image.LANCZOS)
+    return image
+
+
+def encode(image, image_format):
+    if image_format == 'JPEG' and image.mode == 'RGBA':
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    buffer = BytesIO()
+    image.save(
+        buffer, image_format, quality=RENDITION_QUALITY,
+        **SAVE_OPTIONS[image_format]
+    )
+    return buffer.getvalue()
+
+
+def render(source, renditions):
+    side = max(
+        max(width, height) for width, height, crop in renditions.values()
+    )
+    with default_storage.open(source) as file, Image.open(file) as image:
+        image.draft(None, (side, side))
+        image = prepare(image)
+    files = {}
+    for name, (width, height, crop) in renditions.items():
+        resized = resize(image, width, height, crop)
+        files[name] = {}
+        for extension, image_format in RENDITION_FORMATS:
+            path = rendition_path(source, name, extension)
+            if rendition_storage.exists(path):
+                rendition_storage.delete(path)
+            files[name][extension] = rendition_storage.save(
+                path, ContentFile(encode(resized, image_format))
+            )
+    return files
+
+
+def delete_files(paths):
+    for path in paths:
+        rendition_storage.delete(path)
+
+
+def delete_unused(model, source, paths):
+    field, renditions = IMAGE_FIELDS[model]
+    if paths and not model.objects.filter(**{field: source}).exists():
+        delete_files(paths)
+
+
+def update_renditions(model, pk, source):
+    field, renditions = IMAGE_FIELDS[model]
+    name = renditions_field(field)
+    previous = model.objects.filter(pk=pk).values_list(
+        name, flat=True
+    ).first()
+    if previous is None:
+        return False
+    files = {}
+    if source:
+        try:
+            files = render(source, renditions)
+        except Exception:
+            logger.exception('Не удалось обработать изображение %s', source)
+    updated = model.objects.filter(pk=pk, **{field: source}).update(
+        **{name: {'source': source, 'files': files}}
+    )
+    if updated:
+        delete_unused(
+            model, previous.get('source'),
+            rendition_paths(previous.get('files', {}))
+            - rendition_paths(files)
+        )
+    else:
+        delete_unused(model, source, rendition_paths(files))
+    return bool(updated and files)
+
+
+def run_in_pool(model, pk, source):
+    try:
+        update_renditions(model, pk, source)
+    finally:
+        connections.close_all()
+
+
+@lru_cache(maxsize=None)
+def get_pool():
+    return ThreadPoolExecutor(
+        max_workers=settings.IMAGE_WORKERS,
+        thread_name_prefix='renditions'
+    )
+
+
+def schedule_renditions(instance):
+    model = type(instance)
+    field, renditions = IMAGE_FIELDS[model]
+    source = getattr(instance, field).name or ''
+    if getattr(instance, renditions_field(field)).get('source', '') == source:
+        return
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: submit_tracked(
+            'renditions', get_pool(), run_in_pool, model, pk, source
+        )
+    )
+
+
+def delete_renditions_on_commit(instance):
+    model = type(instance)
+    field, renditions = IMAGE_FIELDS[model]
+    previous = getattr(instance, renditions_field(field))
+    paths = rendition_paths(previous.get('files', {}))
+    if paths:
+        transaction.on_commit(
+            lambda: delete_unused(model, previous['source'], paths)
+        )
@@ -0,0 +1,157 @@
+import time
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, namedtuple
+from threading import Lock
+
+from django.db import transaction
+from django.dispatch import receiver
+
+from recipe.cache import namespaced_cache, reference_data_changed
+from recipe.constants import REFERENCE_CACHE_TIMEOUT
+from recipe.models import Ingredient, RecipeComponent
+
+
+TYPECODE = 'q'
+EMPTY = array(TYPECODE)
+
+Coverage = namedtuple('Coverage', ('recipe_id', 'matched', 'total'))
+
+
+def intersect(smaller, larger):
+    result = array(TYPECODE)
+    position = 0
+    for value in smaller:
+        position = bisect_left(larger, value, position)
+        if position == len(larger):
+            break
+        if larger[position] == value:
+            result.append(value)
+    return result
+
+
+class IngredientIndex:
+    NAMESPACE = 'recipe_ingredient_index'
+
+    def __init__(self, cache=namespaced_cache,
+                 timeout=REFERENCE_CACHE_TIMEOUT):
+        self.cache = cache
+        self.timeout = timeout
+        self.lock = Lock()
+        self.version = None
+        self.built_at = None
+        self.postings = {}
+        self.recipe_ingredients = {}
+
+    @staticmethod
+    def build():
+        postings = {}
+        recipe_ingredients = {}
+        for product_id, recipe_id in RecipeComponent.objects.order_by(
+            'product_id', 'recipe_id'
+        ).values_list('product_id', 'recipe_id').iterator():
+            postings.setdefault(product_id, array(TYPECODE)).append(recipe_id)
+            recipe_ingredients.setdefault(
+                recipe_id, array(TYPECODE)
+            ).append(product_id)
+        return postings, recipe_ingredients
+
+    def refresh(self):
+        version = self.cache.get_version(self.NAMESPACE)
+        now = time.monotonic()
+        if version != self.version or now - self.built_at >= self.timeout:
+            self.postings, self.recipe_ingredients = self.build()
+            self.version = version
+            self.built_at = now
+
+    def apply(self, recipe_id, ingredient_ids):
+        old = set(self.recipe_ingredients.pop(recipe_id, EMPTY))
+        new = set(ingredient_ids)
+        for product_id in old - new:
+            postings = self.postings[product_id]
+            del postings[bisect_left(postings, recipe_id)]
+            if not postings:
+                del self.postings[product_id]
+        for product_id in new - old:
+            insort(
+                self.postings.setdefault(product_id, array(TYPECODE)),
+                recipe_id
+            )
+        if new:
+            self.recipe_ingredients[recipe_id] = array(TYPECODE, sorted(new))
+
+    def update_recipe(self, recipe_id, ingredient_ids):
+        with self.lock:
+            expected = self.version
+            version = self.cache.invalidate(self.NAMESPACE)
+            if expected is None or version != expected + 1:
+                self.version = None
+                return
+            self.apply(recipe_id, ingredient_ids)
+            self.version = version
+
+    def update_recipe_on_commit(self, recipe_id, ingredient_ids):
+        ingredient_ids = tuple(ingredient_ids)
+        transaction.on_commit(
+            lambda: self.update_recipe(recipe_id, ingredient_ids)
+        )
+
+    def reload_recipe_on_commit(self, recipe_id):
+        transaction.on_commit(lambda: self.update_recipe(
+            recipe_id, RecipeComponent.objects.filter(
+                recipe_id=recipe_id
+            ).values_list('product_id', flat=True)
+        ))
+
+    def invalidate_on_commit(self):
+        transaction.on_commit(
+            lambda: self.cache.invalidate(self.NAMESPACE)
+        )
+
+    def intersection(self, ingredient_ids):
+        lists = sorted(
+            (self.postings.get(pk, EMPTY) for pk in ingredient_ids), key=len
+        )
+        if not lists:
+            return EMPTY
+        result = lists[0]
+        for postings in lists[1:]:
+            if not result:
+                break
+            result = intersect(result, postings)
+        return result
+
+    def containing_all(self, ingredient_ids):
+        with self.lock:
+            self.refresh()
+            return list(self.intersection(set(ingredient_ids)))
+
+    def coverage(self, ingredient_ids, containing_all=False):
+        ingredient_ids = set(ingredient_ids)
+        with self.lock:
+            self.refresh()
+            if containing_all:
+                matched = dict.fromkeys(
+                    self.intersection(ingredient_ids), len(ingredient_ids)
+                )
+            else:
+                matched = Counter()
+                for pk in ingredient_ids:
+                    matched.update(self.postings.get(pk, EMPTY))
+            rows = [
+                Coverage(
+                    recipe_id, count, len(self.recipe_ingredients[recipe_id])
+                )
+                for recipe_id, count in matched.items()
+            ]
+        return sorted(rows, key=lambda row: (
+            -row.matched / row.total, -row.matched, -row.recipe_id
+        ))
+
+
+ingredient_index = IngredientIndex()
+
+
+@receiver(reference_data_changed, sender=Ingredient)
+def invalidate_ingredient_index(**kwargs):
+    ingredient_index.invalidate_on_commit()
@@ -1,53 +1,315 @@
 import csv
 import json
+import os
+import re
+import time
+from collections import Counter
+from contextlib import nullcontext
+from itertools import islice
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from recipe.cache import reference_cache
+
+
+BATCH_SIZE = 1000
+READ_CHUNK_SIZE = 64 * 1024
+PROGRESS_INTERVAL = 1
+WHITESPACE_RE = re.compile(r'\s*')
+REPORT_HEADER = ('Строка', 'Статус', 'Ключ', 'Описание')
+
+INSERTED = 'добавлено'
+UPDATED = 'обновлено'
+EXISTS = 'уже есть'
+DUPLICATE = 'дубликат'
+CONFLICT = 'конфликт'
+ERROR = 'ошибка'
+
+
+def read_csv(file):
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(file):
+    for number, line in enumerate(file, start=1):
+        if line.strip():
+            yield number, json.loads(line)
+
+
+def read_json(file, chunk_size=READ_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    expected = '['
+    number = 0
+    while True:
+        position = WHITESPACE_RE.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                raise ValueError('Неожиданный конец JSON файла')
+            buffer, position = file.read(chunk_size), 0
+            eof = not buffer
+            continue
+        char = buffer[position]
+        if expected == '[':
+            if char != '[':
+                raise ValueError('JSON файл должен содержать массив')
+            position += 1
+            expected = 'first'
+        elif expected in ('first', ',') and char == ']':
+            return
+        elif expected == ',':
+            if char != ',':
+                raise ValueError(f'Ожидалась запятая после объекта {number}')
+            position += 1
+            expected = 'item'
+        else:
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            number += 1
+            yield number, item
+            expected = ','
+
+
+READERS = {'.csv': read_csv, '.json': read_json, '.jsonl': read_jsonl}
+
+
+def chunked(rows, size):
+    return iter(lambda: list(islice(rows, size)), [])
+
+
+class Checkpoint:
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.path = f'{file_path}.checkpoint'
+
+    def signature(self):
+        stat = os.stat(self.file_path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding='utf-8') as file:
+            state = json.load(file)
+        if state['file'] != self.signature():
+            raise CommandError(
+                f'Файл {self.file_path} изменился после прерванного импорта.'
+                f' Удалите {self.path}, чтобы начать заново.'
+            )
+        return state['rows']
+
+    def save(self, rows):
+        temporary_path = f'{self.path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'file': self.signature(), 'rows': rows}, file)
+        os.replace(temporary_path, self.path)
+
+    def delete(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
 
 
 class BaseImport(BaseCommand):
-    help = 'Импорт данных из CSV и JSON файлов'
+    help = 'Импорт данных из CSV, JSON и JSONL файлов'
     model = None
+    fields = ()
+    unique_fields = ()
 
     def add_arguments(self, parser):
         parser.add_argument('file_path', type=str, help='Путь к файлу')
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк, загружаемых в одной транзакции'
+        )
+        parser.add_argument(
+            '--update', action='store_true',
+            help='Обновлять существующие записи, если данные отличаются'
+        )
+        parser.add_argument(
+            '--report', type=str,
+            help='Путь к CSV отчёту о дубликатах, конфликтах и ошибках'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить прерванный импорт с последней сохранённой пачки'
+        )
 
     def handle(self, *args, **options):
         file_path = options['file_path']
-        try:
-            if file_path.endswith('.csv'):
-                added_count = self.load_from_csv(file_path)
-            elif file_path.endswith('.json'):
-                added_count = self.load_from_json(file_path)
-            else:
-                self.stdout.write(
-                    self.style.ERROR(
-                        'Неподдерживаемый формат файла. Только .csv и .json'
-                    ))
-                return
-
-            self.stdout.write(self.style.SUCCESS(
-                f'Добавлено {added_count}/{self.model.objects.count()}'
-                f' записей из {file_path}'
+        reader = READERS.get(os.path.splitext(file_path)[1].lower())
+        if reader is None:
+            self.stdout.write(self.style.ERROR(
+                'Неподдерживаемый формат файла. Только .csv, .json и .jsonl'
             ))
-
+            return
+        checkpoint = Checkpoint(file_path)
+        processed = checkpoint.load() if options['resume'] else 0
+        self.stats = Counter()
+        self.started = self.reported_at = time.monotonic()
+        self.resumed_from = processed
+        report_mode = 'a' if options['resume'] and processed else 'w'
+        try:
+            with open(
+                file_path, encoding='utf-8', newline=''
+            ) as file, self.open_report(
+                options['report'], report_mode
+            ) as self.report:
+                for batch in chunked(
+                    islice(reader(file), processed, None),
+                    options['batch_size']
+                ):
+                    with transaction.atomic():
+                        self.import_batch(batch, options['update'])
+                    processed += len(batch)
+                    checkpoint.save(processed)
+                    self.progress(processed)
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Ошибка импорта: {e}'))
-
-    def create(self, data):
-        return len(self.model.objects.bulk_create(
-            [self.model(**item) for item in data],
-            ignore_conflicts=True
+            if processed:
+                self.stdout.write(
+                    f'Загружено строк: {processed}. Чтобы продолжить, '
+                    'повторите команду с флагом --resume'
+                )
+            return
+        finally:
+            if self.stats[INSERTED] or self.stats[UPDATED]:
+                reference_cache.invalidate(self.model)
+        checkpoint.delete()
+        self.progress(processed, force=True)
+        self.stdout.write(self.style.SUCCESS(
+            f'Добавлено {self.stats[INSERTED]}/{self.model.objects.count()}'
+            f' записей из {file_path}'
+        ))
+        self.stdout.write(', '.join(
+            f'{status}: {self.stats[status]}'
+            for status in (UPDATED, EXISTS, DUPLICATE, CONFLICT, ERROR)
         ))
 
-    def load_from_file(self, file_path, file_type):
-        with open(file_path, 'r', encoding='utf-8') as file:
-            if file_type == 'csv':
-                return csv.DictReader(file)
-            elif file_type == 'json':
-                return json.load(file)
+    def open_report(self, path, mode):
+        if path is None:
+            return nullcontext()
+        return open(path, mode, encoding='utf-8', newline='')
+
+    def record(self, number, status, key='', description=''):
+        self.stats[status] += 1
+        if self.report is None or status == INSERTED:
+            return
+        if self.report.tell() == 0:
+            csv.writer(self.report).writerow(REPORT_HEADER)
+        csv.writer(self.report).writerow(
+            (number, status, ' / '.join(key), description)
+        )
+
+    def progress(self, processed, force=False):
+        now = time.monotonic()
+        if not force and now - self.reported_at < PROGRESS_INTERVAL:
+            return
+        self.reported_at = now
+        rate = (processed - self.resumed_from) / max(now - self.started, 1e-6)
+        self.stdout.write(
+            f'Обработано строк: {processed}, добавлено: '
+            f'{self.stats[INSERTED]}, {rate:.0f} строк/с'
+        )
 
-    def load_from_csv(self, file_path):
-        return self.create(self.load_from_file(file_path, 'csv'))
+    def clean_row(self, raw):
+        if not isinstance(raw, dict):
+            raise ValueError('Строка должна быть объектом')
+        row = {}
+        for name in self.fields:
+            value = raw.get(name)
+            value = '' if value is None else str(value).strip()
+            if not value:
+                raise ValueError(f'Не заполнено поле {name}')
+            max_length = self.model._meta.get_field(name).max_length
+            if max_length and len(value) > max_length:
+                raise ValueError(
+                    f'Поле {name} длиннее {max_length} символов'
+                )
+            row[name] = value
+        return row
 
-    def load_from_json(self, file_path):
-        return self.create(self.load_from_file(file_path, 'json'))
+    def get_key(self, item):
+        if isinstance(item, dict):
+            return tuple(item[name] for name in self.unique_fields)
+        return tuple(getattr(item, name) for name in self.unique_fields)
+
+    def find_existing(self, keys):
+        if not keys:
+            return {}
+        lookup = f'{self.unique_fields[0]}__in'
+        objects = self.model.objects.filter(
+            **{lookup: {key[0] for key in keys}}
+        ).only('pk', *self.fields)
+        return {
+            key: obj for obj in objects
+            if (key := self.get_key(obj)) in keys
+        }
+
+    def import_batch(self, batch, update):
+        rows = {}
+        for number, raw in batch:
+            try:
+                row = self.clean_row(raw)
+            except ValueError as error:
+                self.record(number, ERROR, description=str(error))
+                continue
+            key = self.get_key(row)
+            if key in rows:
+                self.record(
+                    number, DUPLICATE, key,
+                    f'Повторяет строку {rows[key][0]}'
+                )
+                continue
+            rows[key] = number, row
+        existing = self.find_existing(rows.keys())
+        created = {}
+        changed = []
+        for key, (number, row) in rows.items():
+            obj = existing.get(key)
+            if obj is None:
+                created[key] = self.model(**row)
+                continue
+            difference = {
+                name: value for name, value in row.items()
+                if getattr(obj, name) != value
+            }
+            if not difference:
+                self.record(number, EXISTS, key)
+            elif not update:
+                self.record(number, CONFLICT, key, json.dumps(
+                    difference, ensure_ascii=False
+                ))
+            else:
+                for name, value in difference.items():
+                    setattr(obj, name, value)
+                changed.append(obj)
+                self.record(number, UPDATED, key)
+        if changed:
+            self.model.objects.bulk_update(changed, self.fields)
+        if not created:
+            return
+        self.model.objects.bulk_create(
+            created.values(), ignore_conflicts=True
+        )
+        inserted = self.find_existing(created.keys())
+        for key in created:
+            if key in inserted:
+                self.record(rows[key][0], INSERTED, key)
+            else:
+                self.record(
+                    rows[key][0], CONFLICT, key,
+                    'Нарушено ограничение уникальности'
+                )
@@ -0,0 +1,218 @@
+import io
+import os
+import re
+import time
+from collections import defaultdict
+from datetime import date, datetime, time as datetime_time
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+BATCH_SIZE = 2000
+FORMATS = ('json', 'jsonl')
+MODEL_RE = re.compile(r'"model"\s*:\s*"(\w+\.\w+)"')
+COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'
+})
+
+
+def fixture_format(path):
+    fixture_format = os.path.splitext(path)[1].lstrip('.').lower()
+    if fixture_format not in FORMATS:
+        raise CommandError(
+            f'Неподдерживаемый формат фикстуры {path}. Только .json и .jsonl'
+        )
+    return fixture_format
+
+
+def scan_models(path):
+    fixture_format(path)
+    with open(path, encoding='utf-8') as file:
+        return {
+            apps.get_model(label)
+            for label in set(MODEL_RE.findall(file.read()))
+        }
+
+
+def dependencies(model):
+    return {
+        field.related_model for field in model._meta.get_fields()
+        if field.concrete
+        and (field.many_to_one or field.one_to_one or field.many_to_many)
+        and field.related_model is not model
+    }
+
+
+def order_models(models):
+    models = set(models)
+    pending = {model: dependencies(model) & models for model in models}
+    ordered = []
+    while pending:
+        ready = sorted(
+            (model for model, required in pending.items() if not required),
+            key=lambda model: model._meta.label
+        ) or sorted(pending, key=lambda model: model._meta.label)[:1]
+        for model in ready:
+            del pending[model]
+            for required in pending.values():
+                required.discard(model)
+        ordered.extend(ready)
+    return ordered
+
+
+def order_files(files):
+    models = {path: scan_models(path) for path in files}
+    pending = {
+        path: {
+            other for other in files if other != path and any(
+                dependencies(model) & models[other]
+                for model in models[path]
+            )
+        }
+        for path in files
+    }
+    levels = []
+    while pending:
+        level = [path for path, required in pending.items() if not required]
+        if not level:
+            level = [next(iter(pending))]
+        for path in level:
+            del pending[path]
+            for required in pending.values():
+                required.discard(path)
+        levels.append(level)
+    return levels, set().union(*models.values())
+
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date, datetime_time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, memoryview)):
+        return '\\\\x' + bytes(value).hex()
+    return str(value).translate(COPY_ESCAPES)
+
+
+def copy_objects(model, objects, connection):
+    fields = model._meta.local_concrete_fields
+    buffer = io.StringIO()
+    for obj in objects:
+        buffer.write('\t'.join(
+            copy_value(field.get_db_prep_save(
+                getattr(obj, field.attname), connection
+            ))
+            for field in fields
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            'COPY {} ({}) FROM STDIN'.format(
+                quote_name(model._meta.db_table),
+                ', '.join(quote_name(field.column) for field in fields)
+            ),
+            buffer
+        )
+
+
+def insert_objects(model, objects, connection, batch_size):
+    manager = model._base_manager.using(connection.alias)
+    existing = set()
+    pks = [obj.pk for obj in objects if obj.pk is not None]
+    for start in range(0, len(pks), batch_size):
+        existing.update(manager.filter(
+            pk__in=pks[start:start + batch_size]
+        ).values_list('pk', flat=True))
+    updated = [obj for obj in objects if obj.pk in existing]
+    created = [obj for obj in objects if obj.pk not in existing]
+    if updated:
+        manager.bulk_update(updated, [
+            field.name for field in model._meta.local_concrete_fields
+            if not field.primary_key
+        ], batch_size=batch_size)
+    for start in range(0, len(created), batch_size):
+        batch = created[start:start + batch_size]
+        if connection.vendor == 'postgresql' and all(
+            obj.pk is not None for obj in batch
+        ):
+            copy_objects(model, batch, connection)
+            continue
+        for with_pk in (True, False):
+            objs = [obj for obj in batch if (obj.pk is not None) == with_pk]
+            fields = [
+                field for field in model._meta.local_concrete_fields
+                if with_pk or not field.primary_key
+            ]
+            size = connection.ops.bulk_batch_size(fields, objs) or len(objs)
+            for position in range(0, len(objs), size):
+                manager._insert(
+                    objs[position:position + size], fields=fields, raw=True
+                )
+    return len(created), len(updated)
+
+
+def insert_m2m(model, deserialized_objects, using, batch_size):
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        source = f'{field.m2m_field_name()}_id'
+        target = f'{field.m2m_reverse_field_name()}_id'
+        through._base_manager.using(using).bulk_create((
+            through(**{source: deserialized.object.pk, target: pk})
+            for deserialized in deserialized_objects
+            for pk in deserialized.m2m_data.get(field.name, ())
+        ), batch_size=batch_size, ignore_conflicts=True)
+
+
+def load_file(path, using=DEFAULT_DB_ALIAS, batch_size=BATCH_SIZE):
+    started = time.perf_counter()
+    connection = connections[using]
+    objects = defaultdict(list)
+    with open(path, encoding='utf-8') as file:
+        for deserialized in serializers.deserialize(
+            fixture_format(path), file, using=using,
+            ignorenonexistent=True, handle_forward_references=True
+        ):
+            objects[type(deserialized.object)].append(deserialized)
+    counts = {}
+    with transaction.atomic(using=using):
+        with connection.constraint_checks_disabled():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+            for model in order_models(objects):
+                counts[model._meta.label] = insert_objects(
+                    model,
+                    [deserialized.object for deserialized in objects[model]],
+                    connection, batch_size
+                )
+            for model, deserialized_objects in objects.items():
+                insert_m2m(model, deserialized_objects, using, batch_size)
+            for deserialized_objects in objects.values():
+                for deserialized in deserialized_objects:
+                    if deserialized.deferred_fields:
+                        deserialized.save_deferred_fields(using=using)
+        connection.check_constraints(table_names=[
+            model._meta.db_table for model in objects
+        ])
+    return path, counts, time.perf_counter() - started
+
+
+def close_connections():
+    connections.close_all()
+
+
+def reset_sequences(models, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
@@ -3,5 +3,7 @@ from recipe.models import Ingredient
 
 
 class Command(BaseImport):
-    halp = 'Импорт ингредиентов из CSV или JSON файла'
+    help = 'Импорт ингредиентов из CSV, JSON или JSONL файла'
     model = Ingredient
+    fields = ('name', 'measurement_unit')
+    unique_fields = ('name', 'measurement_unit')
@@ -3,5 +3,7 @@ from recipe.models import Tag
 
 
 class Command(BaseImport):
-    help = 'Загружает теги в БД из CSV или JSON файла'
+    help = 'Загружает теги в БД из CSV, JSON или JSONL файла'
     model = Tag
+    fields = ('name', 'slug')
+    unique_fields = ('slug',)
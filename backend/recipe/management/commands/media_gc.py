@@ -0,0 +1,186 @@
+import os
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from hashlib import blake2b
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipe.images import IMAGE_FIELDS, rendition_paths, renditions_field
+
+
+BUCKETS = 256
+DELETE_BATCH_SIZE = 1000
+QUERY_CHUNK_SIZE = 2000
+PROGRESS_INTERVAL = 1
+
+
+def path_key(path):
+    return int.from_bytes(
+        blake2b(path.encode(), digest_size=8).digest(), 'big'
+    )
+
+
+class PathSet:
+
+    def __init__(self, paths):
+        buckets = [array('Q') for _ in range(BUCKETS)]
+        for path in paths:
+            key = path_key(path)
+            buckets[key % BUCKETS].append(key)
+        self.buckets = [array('Q', sorted(bucket)) for bucket in buckets]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def __contains__(self, path):
+        key = path_key(path)
+        bucket = self.buckets[key % BUCKETS]
+        position = bisect_left(bucket, key)
+        return position < len(bucket) and bucket[position] == key
+
+
+def referenced_paths():
+    for model, (field, renditions) in IMAGE_FIELDS.items():
+        for name, stored_renditions in model.objects.values_list(
+            field, renditions_field(field)
+        ).iterator(chunk_size=QUERY_CHUNK_SIZE):
+            if name:
+                yield name
+            yield from rendition_paths(stored_renditions.get('files', {}))
+
+
+def walk(root):
+    stack = ['']
+    while stack:
+        prefix = stack.pop()
+        with os.scandir(os.path.join(root, prefix)) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(f'{prefix}{entry.name}/')
+                elif entry.is_file(follow_symlinks=False):
+                    yield f'{prefix}{entry.name}', entry
+
+
+def delete_files(root, paths):
+    deleted = 0
+    for path in paths:
+        try:
+            os.remove(os.path.join(root, path))
+        except FileNotFoundError:
+            continue
+        deleted += 1
+    return deleted
+
+
+def prune_directories(root, directories):
+    removed = 0
+    for directory in sorted(directories, key=len, reverse=True):
+        while directory:
+            try:
+                os.rmdir(os.path.join(root, directory))
+            except OSError:
+                break
+            removed += 1
+            directory = os.path.dirname(directory)
+    return removed
+
+
+class Command(BaseCommand):
+    help = (
+        'Находит в MEDIA_ROOT файлы, на которые не ссылаются рецепты и'
+        ' пользователи, и удаляет их'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать найденные файлы, ничего не удалять'
+        )
+        parser.add_argument(
+            '--min-age', type=int, default=3600,
+            help='Не трогать файлы моложе указанного числа секунд'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=8,
+            help='Количество потоков для удаления файлов'
+        )
+
+    def handle(self, *args, **options):
+        root = settings.MEDIA_ROOT
+        if not os.path.isdir(root):
+            self.stdout.write(f'Каталог {root} не найден')
+            return
+        started = time.monotonic()
+        referenced = PathSet(referenced_paths())
+        self.stdout.write(
+            f'Ссылок на файлы в БД: {len(referenced)}'
+            f' ({time.monotonic() - started:.2f} c)'
+        )
+        self.stats = Counter()
+        self.started = self.reported_at = time.monotonic()
+        threshold = time.time() - options['min_age']
+        dry_run = options['dry_run']
+        directories = set()
+        batch = []
+        pending = set()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for path, entry in walk(root):
+                self.stats['files'] += 1
+                self.progress()
+                if path in referenced:
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime > threshold:
+                    self.stats['recent'] += 1
+                    continue
+                self.stats['orphans'] += 1
+                self.stats['bytes'] += stat.st_size
+                if dry_run:
+                    if options['verbosity'] > 1:
+                        self.stdout.write(path)
+                    continue
+                directories.add(os.path.dirname(path))
+                batch.append(path)
+                if len(batch) < DELETE_BATCH_SIZE:
+                    continue
+                if len(pending) >= options['workers'] * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self.collect(done)
+                pending.add(pool.submit(delete_files, root, batch))
+                batch = []
+            if batch:
+                pending.add(pool.submit(delete_files, root, batch))
+            self.collect(wait(pending).done)
+        if directories:
+            self.stats['directories'] = prune_directories(root, directories)
+        self.progress(force=True)
+        action = 'Найдено' if dry_run else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} файлов без ссылок: '
+            f'{self.stats["orphans"] if dry_run else self.stats["deleted"]}'
+            f', {self.stats["bytes"] / 1024 / 1024:.1f} MB'
+        ))
+        self.stdout.write(
+            f'Пропущено новых файлов: {self.stats["recent"]}, '
+            f'удалено пустых каталогов: {self.stats["directories"]}'
+        )
+
+    def collect(self, futures):
+        for future in futures:
+            self.stats['deleted'] += future.result()
+
+    def progress(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.reported_at < PROGRESS_INTERVAL:
+            return
+        self.reported_at = now
+        elapsed = max(now - self.started, 1e-6)
+        self.stdout.write(
+            f'Просмотрено файлов: {self.stats["files"]}, без ссылок: '
+            f'{self.stats["orphans"]}, {self.stats["files"] / elapsed:.0f}'
+            ' файлов/с'
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipe.counters import recount
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики избранного, рецептов и подписок'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = recount()
+        for counter, count in fixed.items():
+            self.stdout.write(f'{counter}: исправлено записей {count}')
+        self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipe.models import Recipe, RecipeLemma
+from recipe.search import INDEX_BATCH_SIZE, reindex_all
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс рецептов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=INDEX_BATCH_SIZE,
+            help='Количество рецептов в одной пачке'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = reindex_all(Recipe, RecipeLemma, options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано рецептов: {indexed}')
+        )
@@ -0,0 +1,68 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from recipe.images import IMAGE_FIELDS, renditions_field, update_renditions
+from recipe.management.bulk_loader import close_connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные копии изображений рецептов и аватарок,'
+        ' для которых они ещё не созданы или устарели'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Количество процессов для обработки изображений'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать копии для всех изображений'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if connection.vendor == 'sqlite':
+            workers = 1
+        for model, (field, renditions) in IMAGE_FIELDS.items():
+            tasks = list(self.get_tasks(model, field, options['force']))
+            started = time.perf_counter()
+            if workers == 1 or len(tasks) < 2:
+                results = [update_renditions(*task) for task in tasks]
+            else:
+                close_connections()
+                with ProcessPoolExecutor(
+                    max_workers=workers, initializer=close_connections
+                ) as pool:
+                    results = list(pool.map(
+                        update_renditions, *zip(*tasks),
+                        chunksize=max(len(tasks) // (workers * 4), 1)
+                    ))
+            elapsed = time.perf_counter() - started
+            rendered = sum(results)
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: обработано'
+                f' {rendered}/{len(tasks)} за {elapsed:.2f} c,'
+                f' {len(tasks) / max(elapsed, 1e-6):.1f} изображений/с'
+            ))
+            if rendered < len(tasks):
+                self.stdout.write(self.style.WARNING(
+                    f'Не удалось обработать: {len(tasks) - rendered}'
+                ))
+
+    def get_tasks(self, model, field, force):
+        for pk, source, renditions in model.objects.exclude(
+            **{field: ''}
+        ).exclude(**{f'{field}__isnull': True}).values_list(
+            'pk', field, renditions_field(field)
+        ).iterator():
+            if (
+                force or renditions.get('source') != source
+                or not renditions.get('files')
+            ):
+                yield model, pk, source
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.3 on 2026-10-18 01:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0002_auto_20250317_0221'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-created_at'], name='recipe_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-created_at'], name='recipe_author_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS recipe_ingredient_name_trgm_idx '
+        'ON recipe_ingredient USING gin (UPPER(name) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'DROP INDEX IF EXISTS recipe_ingredient_name_trgm_idx'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0003_recipe_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
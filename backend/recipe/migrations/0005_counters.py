@@ -0,0 +1,58 @@
+# Generated by Django 3.2.3 on 2026-10-18 01:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+COUNTERS = (
+    ('Favorites', 'recipe', 'Recipe', 'favorites_count'),
+    ('Recipe', 'author', 'User', 'recipes_count'),
+    ('Follow', 'following', 'User', 'followers_count'),
+    ('Follow', 'user', 'User', 'following_count'),
+)
+
+
+def populate_counters(apps, schema_editor):
+    for source, field, target, counter in COUNTERS:
+        source = apps.get_model('recipe', source)
+        apps.get_model('recipe', target).objects.update(**{
+            counter: Coalesce(Subquery(
+                source.objects.filter(
+                    **{field: OuterRef('pk')}
+                ).order_by().values(field).annotate(
+                    total=Count('pk')
+                ).values('total')
+            ), 0)
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0004_ingredient_name_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Понравилось'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Подписчики'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Подписки'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='recipes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Рецепты'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
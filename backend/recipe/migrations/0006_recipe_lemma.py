@@ -0,0 +1,86 @@
+# Generated by Django 3.2.3 on 2026-10-18 01:39
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+from django.db import migrations, models
+import django.db.models.deletion
+import pymorphy2
+
+
+BATCH_SIZE = 1000
+LEMMA_MAX_LENGTH = 64
+NAME_WEIGHT = 3
+TEXT_WEIGHT = 1
+WORD_RE = re.compile(r'[а-яa-z0-9]+')
+SKIPPED_PARTS_OF_SPEECH = {'PREP', 'CONJ', 'PRCL', 'INTJ', 'NPRO'}
+
+
+def index_existing_recipes(apps, schema_editor):
+    Recipe = apps.get_model('recipe', 'Recipe')
+    RecipeLemma = apps.get_model('recipe', 'RecipeLemma')
+    if not Recipe.objects.exists():
+        return
+    morph = pymorphy2.MorphAnalyzer()
+
+    @lru_cache(maxsize=100_000)
+    def lemmatize_word(word):
+        parse = morph.parse(word)[0]
+        if parse.tag.POS in SKIPPED_PARTS_OF_SPEECH:
+            return None
+        return parse.normal_form.replace('ё', 'е')[:LEMMA_MAX_LENGTH]
+
+    def lemmatize(text):
+        for word in WORD_RE.findall(text.lower().replace('ё', 'е')):
+            if len(word) > 1 and (lemma := lemmatize_word(word)):
+                yield lemma
+
+    def get_lemma_weights(recipe):
+        weights = Counter()
+        for lemma in lemmatize(recipe.name):
+            weights[lemma] += NAME_WEIGHT
+        for lemma in lemmatize(recipe.text):
+            weights[lemma] += TEXT_WEIGHT
+        return weights
+
+    recipes = Recipe.objects.order_by('id').only('id', 'name', 'text')
+    last_id = 0
+    while batch := list(recipes.filter(id__gt=last_id)[:BATCH_SIZE]):
+        RecipeLemma.objects.bulk_create(
+            RecipeLemma(recipe_id=recipe.id, lemma=lemma, weight=weight)
+            for recipe in batch
+            for lemma, weight in get_lemma_weights(recipe).items()
+        )
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0005_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeLemma',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lemma', models.CharField(max_length=64, verbose_name='Лемма')),
+                ('weight', models.PositiveIntegerField(verbose_name='Вес')),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lemmas', to='recipe.recipe', verbose_name='Рецепт')),
+            ],
+            options={
+                'verbose_name': 'Лемма рецепта',
+                'verbose_name_plural': 'Леммы рецептов',
+                'default_related_name': 'lemmas',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='recipelemma',
+            constraint=models.UniqueConstraint(fields=('lemma', 'recipe'), name='unique_lemma_recipe'),
+        ),
+        migrations.RunPython(
+            index_existing_recipes, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.3 on 2026-10-18 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0006_recipe_lemma'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='recipe',
+            name='recipe_created_at_idx',
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-created_at', '-id'], name='recipe_created_at_id_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.3 on 2026-10-18 01:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0007_recipe_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображения'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='avatar_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии аватарки'),
+        ),
+    ]
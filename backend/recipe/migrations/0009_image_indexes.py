@@ -0,0 +1,23 @@
+# Generated by Django 3.2.3 on 2026-10-18 02:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0008_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='image',
+            field=models.ImageField(db_index=True, help_text='Загрузите изображение рецепта.', upload_to='food image', verbose_name='Изображение блюда'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='avatar',
+            field=models.ImageField(db_index=True, default=None, help_text='Загрузите изображение для аватарки.', null=True, upload_to='avatars/', verbose_name='Фотография профиля'),
+        ),
+    ]
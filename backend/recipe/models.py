@@ -7,6 +7,7 @@ from recipe.constants import (
     FIRST_NAME_MAX_LENGTH,
     INGREDIENT_NAME_MAX_LENGTH,
     INGREDIENT_MUNIT_MAX_LENGTH,
+    LEMMA_MAX_LENGTH,
     MIN_INGREDIENT_AMOUNT,
     RECIPE_NAME_MAX_LENGTH,
     SECOND_NAME_MAX_LENGTH,
@@ -38,7 +39,20 @@ class User(AbstractUser):
     avatar = models.ImageField(
         'Фотография профиля', upload_to='avatars/',
         help_text='Загрузите изображение для аватарки.',
-        null=True, default=None,
+        null=True, default=None, db_index=True,
+    )
+    avatar_renditions = models.JSONField(
+        'Уменьшенные копии аватарки', default=dict, blank=True,
+        editable=False
+    )
+    recipes_count = models.PositiveIntegerField(
+        'Рецепты', default=0, editable=False
+    )
+    followers_count = models.PositiveIntegerField(
+        'Подписчики', default=0, editable=False
+    )
+    following_count = models.PositiveIntegerField(
+        'Подписки', default=0, editable=False
     )
 
     USERNAME_FIELD = 'email'
@@ -127,7 +141,11 @@ class Recipe(models.Model):
     tags = models.ManyToManyField(Tag, verbose_name='Теги')
     image = models.ImageField(
         'Изображение блюда', upload_to='food image',
-        help_text='Загрузите изображение рецепта.',
+        help_text='Загрузите изображение рецепта.', db_index=True,
+    )
+    image_renditions = models.JSONField(
+        'Уменьшенные копии изображения', default=dict, blank=True,
+        editable=False
     )
     name = models.CharField(
         'Название',
@@ -148,12 +166,25 @@ class Recipe(models.Model):
         auto_now_add=True, verbose_name='Дата публикации',
         help_text='Дата и время создания рецепта'
     )
+    favorites_count = models.PositiveIntegerField(
+        'Понравилось', default=0, editable=False
+    )
 
     class Meta:
         default_related_name = 'recipes'
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
         ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('-created_at', '-id'),
+                name='recipe_created_at_id_idx'
+            ),
+            models.Index(
+                fields=('author', '-created_at'),
+                name='recipe_author_created_at_idx'
+            ),
+        )
 
     def __str__(self):
         return self.name[:DESCRIPTION_LENGTH]
@@ -186,6 +217,27 @@ class RecipeComponent(models.Model):
         return f'{self.product.name[:DESCRIPTION_LENGTH]} ({self.amount})'
 
 
+class RecipeLemma(models.Model):
+    recipe = models.ForeignKey(
+        Recipe, on_delete=models.CASCADE, verbose_name='Рецепт')
+    lemma = models.CharField('Лемма', max_length=LEMMA_MAX_LENGTH)
+    weight = models.PositiveIntegerField('Вес')
+
+    class Meta:
+        default_related_name = 'lemmas'
+        verbose_name = 'Лемма рецепта'
+        verbose_name_plural = 'Леммы рецептов'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('lemma', 'recipe'),
+                name='unique_lemma_recipe'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.lemma} -> {self.recipe_id}'
+
+
 class UserRecipeRelation(models.Model):
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, verbose_name='Пользователь'
@@ -0,0 +1,89 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+import pymorphy2
+
+from recipe.constants import LEMMA_MAX_LENGTH
+
+
+INDEX_BATCH_SIZE = 1000
+NAME_WEIGHT = 3
+TEXT_WEIGHT = 1
+WORD_RE = re.compile(r'[а-яa-z0-9]+')
+SKIPPED_PARTS_OF_SPEECH = {'PREP', 'CONJ', 'PRCL', 'INTJ', 'NPRO'}
+
+
+@lru_cache(maxsize=None)
+def get_morph():
+    return pymorphy2.MorphAnalyzer()
+
+
+@lru_cache(maxsize=100_000)
+def lemmatize_word(word):
+    parse = get_morph().parse(word)[0]
+    if parse.tag.POS in SKIPPED_PARTS_OF_SPEECH:
+        return None
+    return parse.normal_form.replace('ё', 'е')[:LEMMA_MAX_LENGTH]
+
+
+@lru_cache(maxsize=10_000)
+def word_variants(word):
+    parses = get_morph().parse(word)
+    if parses[0].tag.POS in SKIPPED_PARTS_OF_SPEECH:
+        return frozenset()
+    return frozenset(
+        parse.normal_form.replace('ё', 'е')[:LEMMA_MAX_LENGTH]
+        for parse in parses
+    )
+
+
+def split_words(text):
+    for word in WORD_RE.findall(text.lower().replace('ё', 'е')):
+        if len(word) > 1:
+            yield word
+
+
+def lemmatize(text):
+    for word in split_words(text):
+        if lemma := lemmatize_word(word):
+            yield lemma
+
+
+def query_lemmas(text):
+    return list({
+        variants for word in split_words(text)
+        if (variants := word_variants(word))
+    })
+
+
+def get_lemma_weights(name, text):
+    weights = Counter()
+    for lemma in lemmatize(name):
+        weights[lemma] += NAME_WEIGHT
+    for lemma in lemmatize(text):
+        weights[lemma] += TEXT_WEIGHT
+    return weights
+
+
+def index_recipes(recipes, lemma_model):
+    recipes = list(recipes)
+    lemma_model.objects.filter(recipe__in=recipes).delete()
+    lemma_model.objects.bulk_create(
+        lemma_model(recipe_id=recipe.id, lemma=lemma, weight=weight)
+        for recipe in recipes
+        for lemma, weight in get_lemma_weights(
+            recipe.name, recipe.text
+        ).items()
+    )
+
+
+def reindex_all(recipe_model, lemma_model, batch_size=INDEX_BATCH_SIZE):
+    recipes = recipe_model.objects.order_by('id').only('id', 'name', 'text')
+    last_id = 0
+    indexed = 0
+    while batch := list(recipes.filter(id__gt=last_id)[:batch_size]):
+        index_recipes(batch, lemma_model)
+        last_id = batch[-1].id
+        indexed += len(batch)
+    return indexed
@@ -0,0 +1,65 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from recipe.cache import reference_cache
+from recipe.counters import change_counters
+from recipe.images import (
+    delete_renditions_on_commit,
+    schedule_renditions
+)
+from recipe.ingredient_index import ingredient_index
+from recipe.models import (
+    Favorites,
+    Follow,
+    Ingredient,
+    Recipe,
+    RecipeLemma,
+    Tag,
+    User
+)
+from recipe.search import index_recipes
+
+
+@receiver((post_save, post_delete), sender=Tag)
+@receiver((post_save, post_delete), sender=Ingredient)
+def invalidate_reference_data(sender, **kwargs):
+    reference_cache.invalidate(sender)
+
+
+@receiver(post_save, sender=Favorites)
+@receiver(post_save, sender=Follow)
+@receiver(post_save, sender=Recipe)
+def increase_counters(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        change_counters(instance, 1)
+
+
+@receiver(post_delete, sender=Favorites)
+@receiver(post_delete, sender=Follow)
+@receiver(post_delete, sender=Recipe)
+def decrease_counters(sender, instance, **kwargs):
+    change_counters(instance, -1)
+
+
+@receiver(post_save, sender=Recipe)
+def index_recipe(sender, instance, update_fields, **kwargs):
+    if update_fields is None or {'name', 'text'} & set(update_fields):
+        index_recipes([instance], RecipeLemma)
+
+
+@receiver(post_delete, sender=Recipe)
+def remove_from_ingredient_index(sender, instance, **kwargs):
+    ingredient_index.update_recipe_on_commit(instance.id, ())
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_save, sender=User)
+def render_images(sender, instance, raw, **kwargs):
+    if not raw:
+        schedule_renditions(instance)
+
+
+@receiver(post_delete, sender=Recipe)
+@receiver(post_delete, sender=User)
+def delete_images(sender, instance, **kwargs):
+    delete_renditions_on_commit(instance)
@@ -0,0 +1,58 @@
+import hashlib
+import os
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    @staticmethod
+    def hashed_name(name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        directory, file_name = os.path.split(name)
+        return '/'.join(filter(None, (
+            directory, digest[:2], digest[2:4],
+            digest + os.path.splitext(file_name)[1].lower()
+        )))
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def make_directory(self, directory):
+        if self.directory_permissions_mode is None:
+            os.makedirs(directory, exist_ok=True)
+            return
+        old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+        try:
+            os.makedirs(
+                directory, self.directory_permissions_mode, exist_ok=True
+            )
+        finally:
+            os.umask(old_umask)
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            os.utime(full_path)
+            return name
+        self.make_directory(os.path.dirname(full_path))
+        temporary_path = f'{full_path}.{uuid.uuid4().hex}.tmp'
+        fd = os.open(temporary_path, self.OS_OPEN_FLAGS, 0o666)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                for chunk in content.chunks():
+                    file.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary_path, self.file_permissions_mode)
+            os.replace(temporary_path, full_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        return name
@@ -0,0 +1,91 @@
+import tempfile
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from recipe.cache import NamespacedCache, namespaced_cache
+from recipe.models import Tag
+
+
+class NamespacedCacheTests:
+    caches = None
+
+    def setUp(self):
+        override = override_settings(CACHES=self.caches)
+        override.enable()
+        self.addCleanup(override.disable)
+        caches['default'].clear()
+        self.cache = NamespacedCache()
+
+    def test_invalidate_bumps_version(self):
+        version = self.cache.get_version('tags')
+        self.cache.set('tags', 'list', ['breakfast'])
+        self.assertEqual(self.cache.invalidate('tags'), version + 1)
+        self.assertEqual(self.cache.get_version('tags'), version + 1)
+        self.assertIsNone(self.cache.get('tags', 'list'))
+
+    def test_invalidate_creates_missing_version(self):
+        version = self.cache.invalidate('tags')
+        self.assertEqual(self.cache.get_version('tags'), version)
+
+    def test_invalidate_keeps_other_namespaces(self):
+        self.cache.set('tags', 'list', ['breakfast'])
+        self.cache.set('ingredients', 'list', ['salt'])
+        self.cache.invalidate('tags')
+        self.assertIsNone(self.cache.get('tags', 'list'))
+        self.assertEqual(self.cache.get('ingredients', 'list'), ['salt'])
+
+    def test_hit_and_miss_counters(self):
+        self.cache.get('tags', 'list')
+        self.cache.set('tags', 'list', ['breakfast'])
+        self.cache.get('tags', 'list')
+        self.cache.get_or_set('tags', 'slugs', lambda: ['breakfast'])
+        self.cache.get_or_set('tags', 'slugs', lambda: self.fail())
+        self.cache.get('ingredients', 'list')
+        self.assertEqual(self.cache.stats(), {
+            'tags': {'hits': 2, 'misses': 2},
+            'ingredients': {'hits': 0, 'misses': 1},
+        })
+
+    def test_write_invalidates_reference_data(self):
+        namespace = 'recipe.tag'
+        client = APIClient()
+        Tag.objects.create(name='Завтрак', slug='breakfast')
+        self.assertEqual(len(client.get('/api/tags/').json()), 1)
+        version = namespaced_cache.get_version(namespace)
+        Tag.objects.create(name='Обед', slug='lunch')
+        self.assertGreater(namespaced_cache.get_version(namespace), version)
+        self.assertEqual(
+            [tag['slug'] for tag in client.get('/api/tags/').json()],
+            ['breakfast', 'lunch']
+        )
+
+
+class LocMemCacheTest(NamespacedCacheTests, TestCase):
+    caches = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'recipe-tests',
+        }
+    }
+
+
+class FileBasedCacheTest(NamespacedCacheTests, TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.caches = {
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': cls.directory.name,
+            }
+        }
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.directory.cleanup()
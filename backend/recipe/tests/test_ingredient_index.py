@@ -0,0 +1,41 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from recipe.cache import NamespacedCache
+from recipe.ingredient_index import IngredientIndex
+from recipe.models import Ingredient, Recipe, RecipeComponent, User
+
+
+class IngredientIndexTimeoutTest(TestCase):
+
+    def setUp(self):
+        self.index = IngredientIndex(cache=NamespacedCache(), timeout=60)
+        self.product = Ingredient.objects.create(
+            name='Соль', measurement_unit='г'
+        )
+        self.author = User.objects.create_user(
+            username='author', email='author@example.com', password='pass'
+        )
+
+    def add_recipe(self):
+        recipe = Recipe.objects.create(
+            author=self.author, name='Рецепт', text='Описание',
+            cooking_time=5, image='recipes/image.png'
+        )
+        RecipeComponent.objects.create(
+            recipe=recipe, product=self.product, amount=1
+        )
+        return recipe
+
+    def test_rebuilds_after_timeout_without_version_change(self):
+        with mock.patch('recipe.ingredient_index.time.monotonic') as clock:
+            clock.return_value = 1000
+            self.assertEqual(self.index.containing_all([self.product.pk]), [])
+            recipe = self.add_recipe()
+            clock.return_value = 1059
+            self.assertEqual(self.index.containing_all([self.product.pk]), [])
+            clock.return_value = 1060
+            self.assertEqual(
+                self.index.containing_all([self.product.pk]), [recipe.pk]
+            )
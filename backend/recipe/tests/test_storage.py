@@ -0,0 +1,50 @@
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+
+from recipe.storage import ContentAddressedStorage
+
+
+class ContentAddressedStorageTest(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.storage = ContentAddressedStorage(location=self.root)
+        self.content = b'image' * 1000
+        digest = hashlib.sha256(self.content).hexdigest()
+        self.name = f'food image/{digest[:2]}/{digest[2:4]}/{digest}.jpg'
+
+    def save(self, name='food image/Photo.JPG'):
+        return self.storage.save(name, ContentFile(self.content))
+
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(path, name), self.root)
+            for path, directories, names in os.walk(self.root)
+            for name in names
+        )
+
+    def test_save_names_file_by_content_hash(self):
+        self.assertEqual(self.save(), self.name)
+        self.assertEqual(self.stored_files(), [self.name])
+        with self.storage.open(self.name) as file:
+            self.assertEqual(file.read(), self.content)
+
+    def test_existing_file_is_reused(self):
+        self.save()
+        os.utime(self.storage.path(self.name), (0, 0))
+        self.assertEqual(self.save('food image/other.jpg'), self.name)
+        self.assertEqual(self.stored_files(), [self.name])
+        self.assertGreater(os.path.getmtime(self.storage.path(self.name)), 0)
+
+    def test_concurrent_saves_share_hashed_name(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            names = set(pool.map(lambda index: self.save(), range(32)))
+        self.assertEqual(names, {self.name})
+        self.assertEqual(self.stored_files(), [self.name])